@@ -3,15 +3,18 @@
 Script to check if repository states have changed
 Returns exit code 0 if there are changes, 1 if no changes
 """
+import hashlib
 import json
 import sys
 from datetime import datetime
 
+from jsonio import loads_json
+
 def load_json(filename):
-    """Load JSON file"""
+    """Load JSON file (with orjson when available)"""
     try:
-        with open(filename, 'r') as f:
-            return json.load(f)
+        with open(filename, 'rb') as f:
+            return loads_json(f.read())
     except FileNotFoundError:
         return None
     except json.JSONDecodeError:
@@ -22,9 +25,19 @@ def get_repo_state(repo_info):
     return {
         'status': repo_info.get('status'),
         'http_code': repo_info.get('http_code'),
-        'last_update': repo_info.get('last_update')
+        'last_update': repo_info.get('last_update'),
+        'content_hash': repo_info.get('content_hash')
     }
 
+def state_hash(repos):
+    """Compute a stable digest of the relevant state of every repository"""
+    h = hashlib.blake2b(digest_size=16)
+    for repo_name in sorted(repos):
+        state = get_repo_state(repos[repo_name])
+        h.update(repo_name.encode())
+        h.update(repr((state['status'], state['http_code'], state['last_update'], state['content_hash'])).encode())
+    return h.digest()
+
 def main():
     # Load current history
     history = load_json('history.json')
@@ -40,6 +53,11 @@ def main():
     current_repos = current_entry.get('repos', {})
     last_repos = last_entry.get('repos', {})
 
+    # Fast path: identical digests mean nothing relevant changed
+    if state_hash(current_repos) == state_hash(last_repos):
+        print("✓ No changes detected - states are the same")
+        sys.exit(1)  # Exit 1 means no changes
+
     changes_detected = False
     changes = []
 
@@ -52,6 +70,12 @@ def main():
             changes_detected = True
             changes.append(f"  - {repo_name}: status changed from '{last_state['status']}' to '{current_state['status']}'")
 
+        # Both entries carry a content hash: it alone tells if the repository changed
+        elif current_state['content_hash'] and last_state['content_hash']:
+            if current_state['content_hash'] != last_state['content_hash']:
+                changes_detected = True
+                changes.append(f"  - {repo_name}: repository updated (content changed)")
+
         # Check if last_update changed (repository was updated)
         elif current_state['last_update'] != last_state['last_update']:
             changes_detected = True
@@ -3,17 +3,70 @@
 Script to fetch detailed package information from LliureX repositories
 """
 import requests
-from datetime import datetime
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Iterator, BinaryIO, TextIO
 import gzip
+import hashlib
+import heapq
+from functools import lru_cache
+from html import escape
 import io
 import re
 import json
 import os
+import sys
+
+from jsonio import dumps_json, loads_json, write_atomic
+from lliurex_fetch import LLIUREX_BASE_URL, UBUNTU_VERSIONS, STATE_DIR
 
-LLIUREX_BASE_URL = "http://lliurex.net"
-UBUNTU_VERSIONS = ["jammy", "noble"]
 COMPONENTS = ["main", "import", "testing"]
+ARCHITECTURES = ["amd64", "i386", "all"]
+
+# Packages indexes are fetched concurrently; size the connection pool to match
+MAX_WORKERS = 16
+
+# Local cache of downloaded indexes, used to make conditional requests
+CACHE_DIR = ".cache"
+INDEX_CACHE_FILE = os.path.join(CACHE_DIR, "etag_cache.json")
+INDEX_CACHE_DIR = os.path.join(CACHE_DIR, "indexes")
+# Bumped whenever parse_packages_file output changes, so indexes parsed by
+# an older version are parsed again
+INDEX_FORMAT_VERSION = 2
+SUMMARY_CACHE_DIR = os.path.join(CACHE_DIR, "summaries")
+# Bumped whenever get_package_summary output changes (fields, ordering...),
+# so summaries computed by an older version are not reused
+SUMMARY_FORMAT_VERSION = 2
+# Digests of the last content saved to each Firebase node
+PUBLISHED_CACHE_FILE = os.path.join(CACHE_DIR, "firebase_published.json")
+
+def create_session() -> requests.Session:
+    """Create the shared HTTP session (keep-alive pool + retries on server errors)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=MAX_WORKERS,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            raise_on_status=False
+        )
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Only advertise encodings urllib3 can always decode (no brotli/zstd
+    # dependency) and identify the monitor to the mirror
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "User-Agent": "lliurex-state/1.0"
+    })
+    return session
+
+SESSION = create_session()
 
 def load_status_data() -> Dict:
     """Load both external and local status data"""
@@ -25,8 +78,8 @@ def load_status_data() -> Dict:
     # Load external status (GitHub Actions)
     try:
         if os.path.exists("history.json"):
-            with open("history.json", "r") as f:
-                history = json.load(f)
+            with open("history.json", "rb") as f:
+                history = loads_json(f.read())
                 if history:
                     status_data['external'] = history[-1]
     except Exception as e:
@@ -35,8 +88,8 @@ def load_status_data() -> Dict:
     # Load local status
     try:
         if os.path.exists("local_status.json"):
-            with open("local_status.json", "r") as f:
-                local_status = json.load(f)
+            with open("local_status.json", "rb") as f:
+                local_status = loads_json(f.read())
                 if local_status:
                     # Handle both old format (array) and new format (object)
                     if isinstance(local_status, list):
@@ -48,120 +101,404 @@ def load_status_data() -> Dict:
 
     return status_data
 
-def parse_packages_file(content: str) -> List[Dict]:
-    """Parse a Packages file and extract package information"""
-    packages = []
-    current_package = {}
-    current_field = None
-
-    for line in content.split('\n'):
-        if line.strip() == '':
-            # Empty line marks end of package entry
-            if current_package:
-                packages.append(current_package)
-                current_package = {}
-                current_field = None
-        elif line.startswith(' ') or line.startswith('\t'):
-            # Continuation of previous field (multiline value)
-            if current_field and current_field in current_package:
-                current_package[current_field] += ' ' + line.strip()
-        elif ':' in line:
-            # New field
-            key, value = line.split(':', 1)
-            key = key.strip()
-            value = value.strip()
-            current_package[key] = value
-            current_field = key
-
-    if current_package:
-        packages.append(current_package)
+# Fields of a Packages stanza used anywhere downstream; the rest (Depends,
+# checksums, long descriptions...) is dropped while parsing, so the
+# latest_packages/largest_packages/recent_changes entries published in
+# packages_state.json only carry these fields
+WANTED_FIELDS = frozenset(('Package', 'Version', 'Architecture', 'Size', 'Filename', 'Description'))
+# Fields with a handful of distinct values; they are interned so every
+# package shares the same string objects
+INTERNED_FIELDS = frozenset(('Architecture',))
+# Only the start of the description is ever published (in characters)
+DESCRIPTION_MAX_LEN = 100
+DESCRIPTION_MAX_BYTES = DESCRIPTION_MAX_LEN * 4
+
+# Stanzas are separated by empty (or whitespace-only) lines
+_STANZA_SEP_RE = re.compile(rb'\n[^\S\n]*\n')
+# Byte needles locating each wanted field at the start of a line, with
+# their length and whether the decoded value is interned
+_FIELD_NEEDLES = tuple(
+    (('\n' + field + ':').encode(), len(field) + 2, field, field in INTERNED_FIELDS)
+    for field in WANTED_FIELDS
+)
+PARSE_CHUNK_SIZE = 1 << 20
+
+def parse_stanza(stanza: bytes) -> Dict:
+    """Parse the WANTED_FIELDS of a single Packages stanza
+
+    Each wanted field is located with bytes.find instead of splitting and
+    partitioning every line, and only the values kept are decoded.
+
+    >>> stanza = 'Package: p\\nDescription: {}\\n {}'.format('à' * 60, 'é' * 60)
+    >>> len(parse_stanza(stanza.encode('utf-8'))['Description'])
+    100
+    """
+    stanza = b'\n' + stanza
+    find = stanza.find
+    end_of_stanza = len(stanza)
+
+    # Keep the fields in the order they appear in the stanza
+    found = []
+    for needle, needle_len, field, interned in _FIELD_NEEDLES:
+        pos = find(needle)
+        if pos >= 0:
+            found.append((pos, needle_len, field, interned))
+    found.sort()
+
+    package = {}
+    for pos, needle_len, field, interned in found:
+        start = pos + needle_len
+        end = find(b'\n', start)
+        if end < 0:
+            end = end_of_stanza
+        value = stanza[start:end].strip()
+        if field == 'Description':
+            # Continuation lines start with a space or a tab. The length is
+            # in bytes here, so collect enough for DESCRIPTION_MAX_LEN
+            # characters of UTF-8 (up to 4 bytes each) before cutting
+            while end + 1 < end_of_stanza and stanza[end + 1] in b' \t' and len(value) < DESCRIPTION_MAX_BYTES:
+                next_end = find(b'\n', end + 1)
+                if next_end < 0:
+                    next_end = end_of_stanza
+                value += b' ' + stanza[end + 1:next_end].strip()
+                end = next_end
+            package[field] = value.decode('utf-8')[:DESCRIPTION_MAX_LEN]
+            continue
+        package[field] = sys.intern(value.decode('utf-8')) if interned else value.decode('utf-8')
+    return package
+
+def parse_packages_file(stream: BinaryIO) -> Iterator[Dict]:
+    """Parse a Packages file and yield each package entry
+
+    The decompressed bytes are read in large chunks and cut into stanzas,
+    which are parsed by parse_stanza. Only WANTED_FIELDS are kept, and
+    Description continuation lines are only accumulated up to
+    DESCRIPTION_MAX_LEN characters.
+
+    Args:
+        stream: Binary stream over the decompressed index
+    """
+    read = stream.read
+    split_stanzas = _STANZA_SEP_RE.split
+    pending = b''
+    while True:
+        chunk = read(PARSE_CHUNK_SIZE)
+        if not chunk:
+            break
+        stanzas = split_stanzas(pending + chunk)
+        # The last piece may be an incomplete stanza, keep it for the next chunk
+        pending = stanzas.pop()
+        for stanza in stanzas:
+            package = parse_stanza(stanza)
+            if package:
+                yield package
+
+    if pending:
+        package = parse_stanza(pending)
+        if package:
+            yield package
+
+def http_date_to_iso(value: str) -> str:
+    """Convert an HTTP date header to ISO format (returned unchanged if unparseable)"""
+    try:
+        from email.utils import parsedate_to_datetime
+        return parsedate_to_datetime(value).strftime("%Y-%m-%d %H:%M:%S")
+    except:
+        return value
+
+def load_index_cache() -> Dict:
+    """Load the per-URL validators (ETag/Last-Modified) of previously fetched indexes"""
+    try:
+        with open(INDEX_CACHE_FILE, "rb") as f:
+            content = f.read().strip()
+            if not content:
+                return {}
+            return loads_json(content)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
 
+def save_index_cache(cache: Dict):
+    """Save the per-URL validators of fetched indexes
+
+    Parsed indexes no longer referenced by any entry are removed.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    write_atomic(INDEX_CACHE_FILE, dumps_json(cache, indent=False))
+
+    referenced = {os.path.basename(entry.get('path', '')) for entry in cache.values()}
+    if os.path.isdir(INDEX_CACHE_DIR):
+        for name in os.listdir(INDEX_CACHE_DIR):
+            if name not in referenced:
+                os.remove(os.path.join(INDEX_CACHE_DIR, name))
+
+def summary_cache_key(content_hash: str, previous_packages: Dict) -> str:
+    """Key of a component summary: its format, the parser format, its indexes content and the previous state it was compared to"""
+    h = hashlib.blake2b(f"{SUMMARY_FORMAT_VERSION}:{INDEX_FORMAT_VERSION}:{content_hash}".encode(), digest_size=16)
+    h.update(dumps_json(previous_packages, indent=False, sort_keys=True))
+    return h.hexdigest()
+
+def load_cached_summary(version: str, component: str, key: str) -> Optional[Dict]:
+    """Load the summary saved by a previous run if it was computed for the same key"""
+    try:
+        with open(os.path.join(SUMMARY_CACHE_DIR, f"{version}-{component}.json"), "rb") as f:
+            cached = loads_json(f.read())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if cached.get('key') != key:
+        return None
+    return cached.get('summary')
+
+def save_cached_summary(version: str, component: str, key: str, summary: Dict):
+    """Save a component summary for the next run (written atomically)"""
+    os.makedirs(SUMMARY_CACHE_DIR, exist_ok=True)
+    path = os.path.join(SUMMARY_CACHE_DIR, f"{version}-{component}.json")
+    write_atomic(path, dumps_json({'key': key, 'summary': summary}, indent=False))
+
+def cached_index_path(content_hash: str) -> str:
+    """Path of the parsed index with this content hash in the local cache"""
+    return os.path.join(INDEX_CACHE_DIR, f"{content_hash}.v{INDEX_FORMAT_VERSION}.json")
+
+def load_cached_index(path: str) -> List[Dict]:
+    """Load a parsed index from the local cache"""
+    with open(path, "rb") as f:
+        packages = loads_json(f.read())
+    for pkg in packages:
+        for field in INTERNED_FIELDS:
+            if field in pkg:
+                pkg[field] = sys.intern(pkg[field])
     return packages
 
-def fetch_packages_for_version(repo_version: str, dist_name: str, component: str = "main") -> tuple[List[Dict], Optional[str]]:
-    """Fetch all packages for a specific Ubuntu version/dist and component
+def save_cached_index(path: str, packages: List[Dict]):
+    """Save a parsed index to the local cache (atomically, fetches run in parallel)"""
+    os.makedirs(INDEX_CACHE_DIR, exist_ok=True)
+    write_atomic(path, dumps_json(packages, indent=False))
+
+def fetch_packages_index(url: str, cache_entry: Optional[Dict] = None) -> tuple[int, List[Dict], Optional[str], Optional[str], Optional[Dict]]:
+    """Download and parse a single Packages.gz index
+
+    If cache_entry holds the validators of a previous download, the request is
+    made conditional and a 304 reply reuses the packages parsed last time.
+    Parsed indexes are cached by the hash of the compressed body, so a full
+    reply whose content was already seen (e.g. a mirror that re-synced and
+    changed its ETag) is not parsed again either.
+
+    Args:
+        url: Full URL of the Packages.gz file
+        cache_entry: Previous {'etag', 'last_modified', 'path', 'content_hash'} entry for this URL
+
+    Returns:
+        tuple: (HTTP status code, packages list, last_modified timestamp, content hash, new cache entry)
+    """
+    # The index is gzipped already; ask for it as-is so it is never wrapped
+    # in (and decoded from) a second layer of transfer compression
+    headers = {'Accept-Encoding': 'identity'}
+    if cache_entry:
+        if cache_entry.get('etag'):
+            headers['If-None-Match'] = cache_entry['etag']
+        if cache_entry.get('last_modified'):
+            headers['If-Modified-Since'] = cache_entry['last_modified']
+
+    with SESSION.get(url, headers=headers, timeout=30) as response:
+        if response.status_code == 304 and cache_entry:
+            packages = load_cached_index(cache_entry['path'])
+            last_modified = cache_entry.get('last_modified')
+            return 304, packages, http_date_to_iso(last_modified) if last_modified else None, cache_entry.get('content_hash'), cache_entry
+
+        if response.status_code != 200:
+            return response.status_code, [], None, None, None
+
+        # The compressed body is only a few MB; hashing it before parsing lets
+        # a known index be loaded instead of decompressed and parsed again.
+        # Other indexes keep downloading in the pool meanwhile.
+        content = response.content
+        content_hash = hashlib.blake2b(content, digest_size=16).hexdigest()
+        # Identical indexes (e.g. empty ones) share a single file
+        path = cached_index_path(content_hash)
+        if os.path.exists(path):
+            packages = load_cached_index(path)
+        else:
+            with gzip.GzipFile(fileobj=io.BytesIO(content)) as f:
+                packages = list(parse_packages_file(f))
+            save_cached_index(path, packages)
+
+        last_modified = response.headers.get('Last-Modified')
+        new_entry = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': last_modified,
+            'path': path,
+            'content_hash': content_hash
+        }
+
+        return response.status_code, packages, http_date_to_iso(last_modified) if last_modified else None, content_hash, new_entry
+
+def fetch_all_packages(versions: List[str], components: List[str]) -> Dict[tuple, tuple[Dict[str, Dict], Optional[str], Optional[str]]]:
+    """Fetch all Packages indexes for every version/component concurrently
+
+    Every (version, dist, component, arch) index is submitted to a thread pool
+    sharing SESSION, so total time is bounded by the slowest download instead
+    of the sum of all of them. Indexes unchanged since the previous run are
+    answered with 304 and loaded from the local cache.
 
     Args:
-        repo_version: The version folder in the repo (e.g. 'jammy')
-        dist_name: The distribution name (e.g. 'jammy', 'jammy-updates')
-        component: The component name (e.g. 'main')
+        versions: Version folders in the repo (e.g. ['jammy', 'noble'])
+        components: Component names (e.g. ['main', 'import'])
 
     Returns:
-        tuple: (packages list, last_modified timestamp)
+        dict: {(version, component): ({name: newest package}, newest last_modified timestamp, content hash)}
+
+        The content hash of a component combines the hashes of all its indexes
+        and is None if any of them is unknown.
     """
-    packages = []
-    last_modified = None
-
-    # Try different architectures
-    architectures = ["amd64", "i386", "all"]
-
-    for arch in architectures:
-        url = f"{LLIUREX_BASE_URL}/{repo_version}/dists/{dist_name}/{component}/binary-{arch}/Packages.gz"
-
-        try:
-            print(f"  Fetching {dist_name}/{component}/binary-{arch}...", end=' ')
-            response = requests.get(url, timeout=30)
-
-            if response.status_code == 200:
-                # Get Last-Modified header from the first successful response
-                if not last_modified and 'Last-Modified' in response.headers:
-                    last_modified = response.headers['Last-Modified']
-                    # Convert to ISO format
-                    try:
-                        from email.utils import parsedate_to_datetime
-                        dt = parsedate_to_datetime(last_modified)
-                        last_modified = dt.strftime("%Y-%m-%d %H:%M:%S")
-                    except:
-                        pass
-
-                # Decompress gzip content
-                with gzip.GzipFile(fileobj=io.BytesIO(response.content)) as f:
-                    content = f.read().decode('utf-8')
-
-                arch_packages = parse_packages_file(content)
-                packages.extend(arch_packages)
-                print(f"✓ {len(arch_packages)} packages")
-            elif response.status_code == 404:
-                print(f"✗ HTTP 404 (Not Found)")
+    index_cache = load_index_cache()
+    futures = {}
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for version in versions:
+            # Fetch from base, updates, and security
+            for dist in [version, f"{version}-updates", f"{version}-security"]:
+                for component in components:
+                    for arch in ARCHITECTURES:
+                        url = f"{LLIUREX_BASE_URL}/{version}/dists/{dist}/{component}/binary-{arch}/Packages.gz"
+                        cache_entry = index_cache.get(url)
+                        if cache_entry and (cache_entry.get('path') != cached_index_path(cache_entry.get('content_hash', ''))
+                                            or not os.path.exists(cache_entry['path'])):
+                            cache_entry = None
+                        future = executor.submit(fetch_packages_index, url, cache_entry)
+                        futures[future] = (version, dist, component, arch, url)
+
+        for future in as_completed(futures):
+            version, dist, component, arch, url = futures[future]
+            label = f"{dist}/{component}/binary-{arch}"
+            try:
+                status_code, packages, last_modified, content_hash, cache_entry = future.result()
+            except Exception as e:
+                print(f"  {label}: ✗ Error: {str(e)[:50]}")
+                # The cached copy may be what failed (e.g. a corrupt parsed
+                # index behind a 304), so the next run downloads it again
+                index_cache.pop(url, None)
+                continue
+
+            if status_code == 200 or status_code == 304:
+                note = " (unchanged)" if status_code == 304 else ""
+                print(f"  {label}: ✓ {len(packages)} packages{note}")
+                results[(version, dist, component, arch)] = (packages, last_modified, content_hash)
+                if cache_entry:
+                    index_cache[url] = cache_entry
+                else:
+                    index_cache.pop(url, None)
+            elif status_code == 404:
+                print(f"  {label}: ✗ HTTP 404 (Not Found)")
             else:
-                print(f"✗ HTTP {response.status_code}")
-        except Exception as e:
-            print(f"✗ Error: {str(e)[:50]}")
+                print(f"  {label}: ✗ HTTP {status_code}")
+
+    save_index_cache(index_cache)
+
+    # Merge in submission order so results don't depend on completion order,
+    # keeping only the newest version of each package name. Each index list
+    # is dropped as soon as it is merged, so superseded entries are released
+    # instead of staying alive until every index has been processed.
+    combined = {}
+    hashes = {}
+    for version, dist, component, arch, url in futures.values():
+        key = (version, dist, component, arch)
+        if key not in results:
+            continue
+        packages, last_modified, content_hash = results.pop(key)
+        unique_packages, latest_modified, _ = combined.get((version, component), ({}, None, None))
+        get_current = unique_packages.get
+        for pkg in packages:
+            get = pkg.get
+            name = get('Package', '')
+            if name:
+                current = get_current(name)
+                if current is None:
+                    unique_packages[name] = pkg
+                    continue
+                # Arch: all packages are listed again in every binary-<arch>
+                # index with the same version; those need no version compare
+                version_str = get('Version', '')
+                current_version = current.get('Version', '')
+                if version_str != current_version and version_key(version_str) > version_key(current_version):
+                    unique_packages[name] = pkg
+        # Keep the most recent timestamp found
+        if last_modified and (not latest_modified or last_modified > latest_modified):
+            latest_modified = last_modified
+        combined[(version, component)] = (unique_packages, latest_modified, None)
+        hashes.setdefault((version, component), []).append(content_hash)
 
-    return packages, last_modified
+    for key, index_hashes in hashes.items():
+        if None not in index_hashes:
+            unique_packages, latest_modified, _ = combined[key]
+            digest = hashlib.blake2b("".join(index_hashes).encode(), digest_size=16).hexdigest()
+            combined[key] = (unique_packages, latest_modified, digest)
 
-def load_previous_packages(version: str, component: str) -> Dict:
-    """Load previous package state from file"""
+    return combined
+
+@lru_cache(maxsize=1)
+def _load_legacy_packages_state() -> Dict:
+    """Load the old single-file package state (read once per run)
+
+    Only used for components that have no per-component state file yet.
+    """
     try:
-        with open(f"packages_state_internal.json", "r") as f:
+        with open("packages_state_internal.json", "rb") as f:
             content = f.read().strip()
             if not content:
                 return {}
-            state = json.loads(content)
-            return state.get(version, {}).get(component, {})
+            return loads_json(content)
     except (FileNotFoundError, json.JSONDecodeError):
         return {}
 
-def save_packages_state(all_packages_state: Dict):
-    """Save current package state to file (internal format)"""
-    with open("packages_state_internal.json", "w") as f:
-        json.dump(all_packages_state, f, indent=2)
+def packages_state_file(version: str, component: str) -> str:
+    """Path of the internal package state file of a version/component"""
+    return os.path.join(STATE_DIR, f"{version}_{component}.json")
+
+@lru_cache(maxsize=None)
+def load_previous_packages(version: str, component: str) -> Dict:
+    """Load previous package state of a version/component"""
+    try:
+        with open(packages_state_file(version, component), "rb") as f:
+            content = f.read().strip()
+            if not content:
+                return {}
+            return loads_json(content)
+    except FileNotFoundError:
+        return _load_legacy_packages_state().get(version, {}).get(component, {})
+    except json.JSONDecodeError:
+        return {}
+
+def save_packages_state(version: str, component: str, packages_dict: Dict) -> bool:
+    """Save current package state of a version/component (internal format)
+
+    The file is only rewritten when its content changes.
+
+    Returns:
+        bool: True if the file was written
+    """
+    os.makedirs(STATE_DIR, exist_ok=True)
+    written = write_if_changed(packages_state_file(version, component), dumps_json(packages_dict, indent=False))
+    load_previous_packages.cache_clear()
+    return written
 
 def load_change_timestamps() -> Dict:
     """Load timestamps of when changes were detected"""
     try:
-        with open("changes_timestamps.json", "r") as f:
+        with open("changes_timestamps.json", "rb") as f:
             content = f.read().strip()
             if not content:
                 return {}
-            return json.loads(content)
+            return loads_json(content)
     except (FileNotFoundError, json.JSONDecodeError):
         return {}
 
-def save_change_timestamps(timestamps: Dict):
-    """Save timestamps of changes"""
-    with open("changes_timestamps.json", "w") as f:
-        json.dump(timestamps, f, indent=2)
+def save_change_timestamps(timestamps: Dict) -> bool:
+    """Save timestamps of changes
+
+    Returns:
+        bool: True if the file was written (False if it was unchanged)
+    """
+    return write_if_changed("changes_timestamps.json", dumps_json(timestamps))
 
 def get_package_modification_date(version: str, filename: str) -> Optional[str]:
     """Get the Last-Modified date of a package file from the repository
@@ -176,7 +513,7 @@ def get_package_modification_date(version: str, filename: str) -> Optional[str]:
     try:
         url = f"{LLIUREX_BASE_URL}/{version}/{filename}"
         # Use HEAD request to only get headers, not download the file
-        response = requests.head(url, timeout=10, allow_redirects=True)
+        response = SESSION.head(url, timeout=10, allow_redirects=True)
 
         if response.status_code == 200 and 'Last-Modified' in response.headers:
             last_modified = response.headers['Last-Modified']
@@ -192,7 +529,11 @@ def get_package_modification_date(version: str, filename: str) -> Optional[str]:
 
     return None
 
-def compare_packages(current_packages: List[Dict], previous_packages: Dict, version: str, component: str, repo_last_modified: Optional[str] = None) -> List[Dict]:
+# Stands for a name missing from the previous state (never equal to a version)
+_NOT_SEEN = object()
+
+def compare_packages(current_packages: List[Dict], previous_packages: Dict, version: str, component: str, repo_last_modified: Optional[str] = None,
+                     all_timestamps: Optional[Dict] = None) -> List[Dict]:
     """Compare current packages with previous state and find updates
 
     Args:
@@ -201,15 +542,19 @@ def compare_packages(current_packages: List[Dict], previous_packages: Dict, vers
         version: Ubuntu version (focal, jammy, noble)
         component: Component name (main, import, testing)
         repo_last_modified: Last-Modified date from repository (for new changes) - NOT USED anymore
+        all_timestamps: Change timestamps of every version/component, updated in
+            place; the caller saves them. If None they are loaded and saved here.
     """
     from datetime import timedelta
 
     updated = []
     new = []
-    current_time = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    current_time = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
     # Load existing timestamps
-    all_timestamps = load_change_timestamps()
+    save_timestamps = all_timestamps is None
+    if save_timestamps:
+        all_timestamps = load_change_timestamps()
     if version not in all_timestamps:
         all_timestamps[version] = {}
     if component not in all_timestamps[version]:
@@ -217,17 +562,32 @@ def compare_packages(current_packages: List[Dict], previous_packages: Dict, vers
 
     timestamps = all_timestamps[version][component]
 
-    # First pass: ensure ALL packages have timestamps
-    packages_processed = 0
+    # First pass: ensure ALL packages have timestamps, and keep the packages
+    # whose (name, version) pair is not in the previous state. Unchanged
+    # packages, the vast majority, are not looked at again.
+    missing = {}
+    changed = []
+    previous_version_of = previous_packages.get
     for pkg in current_packages:
         name = pkg.get('Package', '')
         version_str = pkg.get('Version', '')
         pkg_key = f"{name}:{version_str}"
-
-        # If package doesn't have timestamp, get it from the .deb file
         if pkg_key not in timestamps:
-            filename = pkg.get('Filename', '')
-            pkg_mod_date = get_package_modification_date(version, filename) if filename else None
+            missing[pkg_key] = pkg.get('Filename', '')
+        if previous_version_of(name, _NOT_SEEN) != version_str:
+            changed.append((pkg, name, version_str, pkg_key))
+
+    # Packages without timestamp get it from the .deb file; the HEAD requests
+    # are independent, so they run concurrently on the shared session.
+    # Results are collected in package order to keep the timestamps file stable.
+    packages_processed = 0
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            pkg_key: executor.submit(get_package_modification_date, version, filename)
+            for pkg_key, filename in missing.items() if filename
+        }
+        for pkg_key in missing:
+            pkg_mod_date = futures[pkg_key].result() if pkg_key in futures else None
             timestamps[pkg_key] = pkg_mod_date if pkg_mod_date else current_time
             packages_processed += 1
             if packages_processed % 100 == 0:
@@ -235,22 +595,17 @@ def compare_packages(current_packages: List[Dict], previous_packages: Dict, vers
 
     print(f"  ✓ Assigned timestamps to {packages_processed} packages")
 
-    # Second pass: detect changes for "recent changes" section
-    for pkg in current_packages:
-        name = pkg.get('Package', '')
-        version_str = pkg.get('Version', '')
-        pkg_key = f"{name}:{version_str}"
-
+    # Second pass: classify changes for "recent changes" section
+    for pkg, name, version_str, pkg_key in changed:
         if name in previous_packages:
-            # Package existed before, check if version changed
-            if previous_packages[name] != version_str:
-                print(f"    Update detected: {name} {version_str} (modified: {timestamps[pkg_key]})")
-                updated.append({
-                    **pkg,
-                    'previous_version': previous_packages[name],
-                    'change_type': 'updated',
-                    'detected_at': timestamps[pkg_key]
-                })
+            # Package existed before with another version
+            print(f"    Update detected: {name} {version_str} (modified: {timestamps[pkg_key]})")
+            updated.append({
+                **pkg,
+                'previous_version': previous_packages[name],
+                'change_type': 'updated',
+                'detected_at': timestamps[pkg_key]
+            })
         else:
             # New package
             print(f"    New package: {name} {version_str} (modified: {timestamps[pkg_key]})")
@@ -261,7 +616,8 @@ def compare_packages(current_packages: List[Dict], previous_packages: Dict, vers
             })
 
     # Save updated timestamps
-    save_change_timestamps(all_timestamps)
+    if save_timestamps:
+        save_change_timestamps(all_timestamps)
 
     # Combine and sort by detection time (most recent first)
     changes = new + updated
@@ -271,14 +627,86 @@ def compare_packages(current_packages: List[Dict], previous_packages: Dict, vers
     # This allows users to select different time periods dynamically
     return changes
 
-def get_package_summary(packages: List[Dict], version: str = None, component: str = None, repo_last_modified: Optional[str] = None) -> Dict:
-    """Generate summary statistics from package list
+_DIGITS = "0123456789"
+
+def _char_order(c: str) -> int:
+    """Weight of a non-digit character in dpkg version ordering"""
+    if c == '~':
+        return -1
+    if c.isascii() and c.isalpha():
+        return ord(c)
+    return ord(c) + 256
+
+def _version_part_key(part: str) -> tuple:
+    """Sort key for an upstream version or revision string
+
+    dpkg compares alternating non-digit/digit runs: characters by weight with
+    the end of a run weighing 0, digit runs numerically, and the shorter
+    string padded with zeros. The weights and numbers are flattened into one
+    sequence and encoded as (preceding zeros, value) tokens so that plain
+    tuple comparison reproduces the zero padding ('~' being the only
+    negative weight, so '1.0~rc1' < '1.0' and '1' == '1-0').
+    """
+    flat = []
+    i, n = 0, len(part)
+    while i < n:
+        start = i
+        while i < n and part[i] not in _DIGITS:
+            i += 1
+        flat.extend(_char_order(c) for c in part[start:i])
+        flat.append(0)
+        start = i
+        while i < n and part[i] in _DIGITS:
+            i += 1
+        flat.append(int(part[start:i] or 0))
+
+    key = []
+    zeros = 0
+    for value in flat:
+        if value == 0:
+            zeros += 1
+        elif value > 0:
+            key.append((1, -zeros, value))
+            zeros = 0
+        else:
+            key.append((-1, zeros, value))
+            zeros = 0
+    # Trailing zeros are dropped; the terminator sorts like infinite padding
+    key.append((0,))
+    return tuple(key)
+
+@lru_cache(maxsize=None)
+def version_key(version: str) -> tuple:
+    """Sort key following Debian version ordering ([epoch:]upstream[-revision])
+
+    Plain string comparison gets cases like '1.10' vs '1.9' or epochs wrong.
+    Keys are memoized since the same versions are compared repeatedly.
+    """
+    epoch, sep, rest = version.partition(':')
+    if not sep or not epoch.isdigit():
+        epoch, rest = '0', version
+    upstream, sep, revision = rest.rpartition('-')
+    if not sep:
+        upstream, revision = rest, ''
+    return (int(epoch), _version_part_key(upstream), _version_part_key(revision))
+
+def parse_size(pkg: Dict) -> int:
+    """Return the package Size field as an int (0 if missing or invalid)"""
+    try:
+        return int(pkg.get('Size', '0') or 0)
+    except ValueError:
+        return 0
+
+def get_package_summary(packages: Dict[str, Dict], version: str = None, component: str = None, repo_last_modified: Optional[str] = None,
+                        all_timestamps: Optional[Dict] = None) -> Dict:
+    """Generate summary statistics from the deduplicated packages
 
     Args:
-        packages: List of packages
+        packages: Dictionary of packages by name (newest version only)
         version: Ubuntu version
         component: Component name
         repo_last_modified: Last-Modified timestamp from repository
+        all_timestamps: Change timestamps passed on to compare_packages
     """
     if not packages:
         return {
@@ -286,64 +714,42 @@ def get_package_summary(packages: List[Dict], version: str = None, component: st
             "total_size": 0,
             "latest_packages": [],
             "largest_packages": [],
-            "recent_changes": []
+            "recent_changes": [],
+            "packages": [],
+            "packages_dict": {}
         }
 
-    # Get unique packages (by name)
-    unique_packages = {}
-    for pkg in packages:
-        name = pkg.get('Package', '')
-        version_str = pkg.get('Version', '')
-        if name:
-            # Keep the latest version
-            if name not in unique_packages:
-                unique_packages[name] = pkg
-            else:
-                # Simple version comparison (not perfect but works for most cases)
-                if version_str > unique_packages[name].get('Version', ''):
-                    unique_packages[name] = pkg
-
-    packages_list = list(unique_packages.values())
-
-    # Load previous state and compare
-    recent_changes = []
-    if version and component:
-        previous_state = load_previous_packages(version, component)
-        recent_changes = compare_packages(packages_list, previous_state, version, component, repo_last_modified)
+    packages_list = list(packages.values())
 
-    # Calculate total size
-    total_size = 0
-    for pkg in packages_list:
-        size_str = pkg.get('Size', '0')
-        try:
-            total_size += int(size_str)
-        except:
-            pass
-
-    # Sort by version (approximate - just alphabetically)
-    sorted_by_version = sorted(
-        packages_list,
-        key=lambda x: x.get('Version', ''),
-        reverse=True
-    )[:20]
-
-    # Sort by size
-    sorted_by_size = sorted(
-        packages_list,
-        key=lambda x: int(x.get('Size', '0')),
-        reverse=True
-    )[:10]
-
-    # Create lightweight package list (only essential fields for display)
+    # Build the per-package columns (size, web entry, version) in one pass
+    sizes = {}
     packages_for_web = []
-    for pkg in packages_list:
+    packages_dict = {}
+    for name, pkg in packages.items():
+        sizes[name] = parse_size(pkg)
         packages_for_web.append({
             'Package': pkg.get('Package'),
             'Version': pkg.get('Version'),
             'Architecture': pkg.get('Architecture'),
             'Size': pkg.get('Size'),
-            'Description': (pkg.get('Description') or '')[:100]  # Truncate description
+            'Description': (pkg.get('Description') or '')[:DESCRIPTION_MAX_LEN]  # Truncate description
         })
+        packages_dict[pkg.get('Package')] = pkg.get('Version')
+
+    # Load previous state and compare
+    recent_changes = []
+    if version and component:
+        previous_state = load_previous_packages(version, component)
+        recent_changes = compare_packages(packages_list, previous_state, version, component, repo_last_modified, all_timestamps)
+
+    # Calculate total size
+    total_size = sum(sizes.values())
+
+    # Top by version
+    sorted_by_version = heapq.nlargest(20, packages_list, key=lambda x: version_key(x.get('Version', '')))
+
+    # Top by size
+    sorted_by_size = [packages[name] for name in heapq.nlargest(10, sizes, key=sizes.__getitem__)]
 
     return {
         "total_packages": len(packages_list),
@@ -352,103 +758,96 @@ def get_package_summary(packages: List[Dict], version: str = None, component: st
         "largest_packages": sorted_by_size,
         "recent_changes": recent_changes,  # Already filtered to last 7 days in compare_packages
         "packages": packages_for_web,  # Full package list with essential fields
-        "packages_dict": {pkg.get('Package'): pkg.get('Version') for pkg in packages_list}  # For change detection
+        "packages_dict": packages_dict  # For change detection
     }
 
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+@lru_cache(maxsize=8192)
 def format_size(bytes_size: int) -> str:
-    """Format bytes to human readable size"""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if bytes_size < 1024.0:
-            return f"{bytes_size:.1f} {unit}"
-        bytes_size /= 1024.0
-    return f"{bytes_size:.1f} TB"
-
-def generate_html_page(version: str, summary: Dict, components_data: Dict, status_data: Optional[Dict] = None) -> str:
-    """Generate HTML page for a specific Ubuntu version"""
-    version_names = {
-        "focal": "20.04 LTS (Focal Fossa)",
-        "jammy": "22.04 LTS (Jammy Jellyfish)",
-        "noble": "24.04 LTS (Noble Numbat)"
-    }
+    """Format bytes to human readable size
 
-    html = f"""<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>LliureX {version.capitalize()} - Repositorio de Paquetes</title>
-    <style>
-        * {{
+    The unit is picked from the bit length of the size (one unit every 10
+    bits), so there is a single division whatever the magnitude. Results are
+    memoized, since the same sizes are rendered in several tables.
+    """
+    if bytes_size < 1024:
+        return f"{bytes_size:.1f} B"
+    unit_idx = min((bytes_size.bit_length() - 1) // 10, 4)
+    return f"{bytes_size / (1 << (unit_idx * 10)):.1f} {_SIZE_UNITS[unit_idx]}"
+
+# Static stylesheets for the generated pages (kept out of the f-strings)
+_VERSION_PAGE_CSS = """        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
-        body {{
+        }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             line-height: 1.6;
             color: #333;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 10px;
             box-shadow: 0 10px 40px rgba(0,0,0,0.2);
             padding: 40px;
-        }}
-        h1 {{
+        }
+        h1 {
             color: #667eea;
             margin-bottom: 10px;
             font-size: 2.5em;
-        }}
-        .subtitle {{
+        }
+        .subtitle {
             color: #666;
             font-size: 1.2em;
             margin-bottom: 30px;
-        }}
-        .stats {{
+        }
+        .stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             margin-bottom: 40px;
-        }}
-        .stat-card {{
+        }
+        .stat-card {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 25px;
             border-radius: 10px;
             box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-        .stat-card h3 {{
+        }
+        .stat-card h3 {
             font-size: 0.9em;
             opacity: 0.9;
             margin-bottom: 10px;
             text-transform: uppercase;
             letter-spacing: 1px;
-        }}
-        .stat-card .value {{
+        }
+        .stat-card .value {
             font-size: 2em;
             font-weight: bold;
-        }}
-        .section {{
+        }
+        .section {
             margin-bottom: 40px;
-        }}
-        .section h2 {{
+        }
+        .section h2 {
             color: #667eea;
             margin-bottom: 20px;
             padding-bottom: 10px;
             border-bottom: 3px solid #667eea;
-        }}
-        .tabs {{
+        }
+        .tabs {
             display: flex;
             gap: 10px;
             margin-bottom: 20px;
             flex-wrap: wrap;
-        }}
-        .tab {{
+        }
+        .tab {
             padding: 10px 20px;
             background: #f0f0f0;
             border: none;
@@ -456,390 +855,111 @@ def generate_html_page(version: str, summary: Dict, components_data: Dict, statu
             cursor: pointer;
             font-size: 1em;
             transition: all 0.3s;
-        }}
-        .tab.active {{
+        }
+        .tab.active {
             background: #667eea;
             color: white;
-        }}
-        .tab:hover {{
+        }
+        .tab:hover {
             background: #764ba2;
             color: white;
-        }}
-        table {{
+        }
+        table {
             width: 100%;
             border-collapse: collapse;
             margin-top: 20px;
-        }}
-        th, td {{
+        }
+        th, td {
             padding: 12px;
             text-align: left;
             border-bottom: 1px solid #ddd;
-        }}
-        th {{
+        }
+        th {
             background: #667eea;
             color: white;
             font-weight: 600;
-        }}
-        tr:hover {{
+        }
+        tr:hover {
             background: #f5f5f5;
-        }}
-        .package-name {{
+        }
+        .package-name {
             font-weight: 600;
             color: #667eea;
-        }}
-        .back-link {{
+        }
+        .back-link {
             display: inline-block;
             margin-bottom: 20px;
             color: #667eea;
             text-decoration: none;
             font-weight: 600;
-        }}
-        .back-link:hover {{
+        }
+        .back-link:hover {
             text-decoration: underline;
-        }}
-        .footer {{
+        }
+        .footer {
             margin-top: 40px;
             padding-top: 20px;
             border-top: 1px solid #ddd;
             text-align: center;
             color: #666;
             font-size: 0.9em;
-        }}
-        .tab-content {{
+        }
+        .tab-content {
             display: none;
-        }}
-        .tab-content.active {{
+        }
+        .tab-content.active {
             display: block;
-        }}
-        .status-badge {{
+        }
+        .status-badge {
             display: inline-block;
             padding: 6px 16px;
             border-radius: 15px;
             font-size: 0.9em;
             font-weight: 600;
             margin-left: 10px;
-        }}
-        .status-badge.online {{
+        }
+        .status-badge.online {
             background: #d4edda;
             color: #155724;
-        }}
-        .status-badge.offline {{
+        }
+        .status-badge.offline {
             background: #f8d7da;
             color: #721c24;
-        }}
-        .connectivity-section {{
+        }
+        .connectivity-section {
             background: #f8f9fa;
             border-radius: 10px;
             padding: 20px;
             margin: 20px 0;
             border-left: 4px solid #667eea;
-        }}
-        .connectivity-section h3 {{
+        }
+        .connectivity-section h3 {
             color: #667eea;
             margin-bottom: 15px;
             font-size: 1.1em;
-        }}
-        .connectivity-grid {{
+        }
+        .connectivity-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 15px;
-        }}
-        .connectivity-item {{
+        }
+        .connectivity-item {
             display: flex;
             justify-content: space-between;
             align-items: center;
             padding: 10px 0;
             border-bottom: 1px solid #dee2e6;
-        }}
-        .connectivity-item:last-child {{
+        }
+        .connectivity-item:last-child {
             border-bottom: none;
-        }}
-        .connectivity-label {{
+        }
+        .connectivity-label {
             color: #666;
             font-size: 0.9em;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <a href="index.html" class="back-link">← Volver al índice</a>
-
-        <h1>Ubuntu {version_names.get(version, version.capitalize())}</h1>
-        <p class="subtitle">Repositorio LliureX - Actualizado el {datetime.utcnow().strftime('%d/%m/%Y %H:%M')} UTC</p>
-"""
-
-    # Add connectivity status if available
-    if status_data:
-        ext_status = None
-        local_status = None
-
-        if status_data.get('external'):
-            ext_data = status_data['external'].get('repos', {}).get(version, {})
-            if ext_data:
-                ext_status = ext_data.get('status', 'unknown')
-
-        if status_data.get('local'):
-            local_data = status_data['local'].get('repos', {}).get(version, {})
-            if local_data:
-                local_status = local_data.get('status', 'unknown')
-
-        if ext_status or local_status:
-            html += """
-        <div class="connectivity-section">
-            <h3>📡 Estado de Conectividad</h3>
-            <div class="connectivity-grid">
-"""
-
-            if ext_status:
-                status_badge = 'online' if ext_status == 'online' else 'offline'
-                status_text = '✓ Online' if ext_status == 'online' else '✗ Offline'
-                timestamp = status_data['external'].get('timestamp', 'N/A')
-                html += f"""
-                <div>
-                    <div class="connectivity-item">
-                        <span class="connectivity-label">🌍 Estado Externo</span>
-                        <span class="status-badge {status_badge}">{status_text}</span>
-                    </div>
-                    <div class="connectivity-item">
-                        <span class="connectivity-label">Última verificación</span>
-                        <span style="font-size: 0.85em;">{timestamp}</span>
-                    </div>
-                </div>
-"""
-
-            if local_status:
-                status_badge = 'online' if local_status == 'online' else 'offline'
-                status_text = '✓ Online' if local_status == 'online' else '✗ Offline'
-                timestamp = status_data['local'].get('timestamp', 'N/A')
-                hostname = status_data['local'].get('hostname', 'N/A')
-                html += f"""
-                <div>
-                    <div class="connectivity-item">
-                        <span class="connectivity-label">🏠 Estado Local</span>
-                        <span class="status-badge {status_badge}">{status_text}</span>
-                    </div>
-                    <div class="connectivity-item">
-                        <span class="connectivity-label">Servidor</span>
-                        <span style="font-size: 0.85em;">{hostname}</span>
-                    </div>
-                    <div class="connectivity-item">
-                        <span class="connectivity-label">Última verificación</span>
-                        <span style="font-size: 0.85em;">{timestamp}</span>
-                    </div>
-                </div>
-"""
-
-            html += """
-            </div>
-        </div>
-"""
-
-    html += """
-        <div class="stats">
-"""
-
-    total_packages = 0
-    total_size = 0
-
-    for component, data in components_data.items():
-        total_packages += data['total_packages']
-        total_size += data['total_size']
-
-    # Count total changes
-    total_changes = sum(len(data.get('recent_changes', [])) for data in components_data.values())
-
-    html += f"""
-            <div class="stat-card">
-                <h3>Total de Paquetes</h3>
-                <div class="value">{total_packages}</div>
-            </div>
-            <div class="stat-card">
-                <h3>Tamaño Total</h3>
-                <div class="value">{format_size(total_size)}</div>
-            </div>
-            <div class="stat-card">
-                <h3>Cambios Recientes</h3>
-                <div class="value">{total_changes}</div>
-            </div>
-        </div>
-"""
-
-    # Recent changes section (if any)
-    if total_changes > 0:
-        html += """
-        <div class="section">
-            <h2>🔄 Cambios Desde la Última Actualización</h2>
-            <div class="tabs">
-"""
-
-        for i, component in enumerate(components_data.keys()):
-            if len(components_data[component].get('recent_changes', [])) > 0:
-                active = "active" if i == 0 else ""
-                html += f'<button class="tab {active}" onclick="showTab(\'changes-{component}\')">{component.capitalize()}</button>\n'
-
-        html += """
-            </div>
+        }
 """
 
-        for i, (component, data) in enumerate(components_data.items()):
-            if len(data.get('recent_changes', [])) > 0:
-                active = "active" if i == 0 else ""
-                html += f"""
-            <div id="changes-{component}" class="tab-content {active}">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Estado</th>
-                            <th>Paquete</th>
-                            <th>Versión Anterior</th>
-                            <th>Versión Nueva</th>
-                            <th>Tamaño</th>
-                            <th>Detectado</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-"""
-
-                for pkg in data['recent_changes'][:30]:
-                    name = pkg.get('Package', 'N/A')
-                    new_version = pkg.get('Version', 'N/A')
-                    old_version = pkg.get('previous_version', '-')
-                    size = format_size(int(pkg.get('Size', '0')))
-                    change_type = pkg.get('change_type', 'unknown')
-                    detected_at = pkg.get('detected_at', 'N/A')
-
-                    # Format timestamp to be more readable
-                    try:
-                        if detected_at != 'N/A':
-                            dt = datetime.strptime(detected_at, "%Y-%m-%d %H:%M:%S")
-                            detected_display = dt.strftime("%d/%m/%Y %H:%M")
-                        else:
-                            detected_display = 'N/A'
-                    except:
-                        detected_display = detected_at
-
-                    if change_type == 'new':
-                        status_badge = '<span style="background: #d4edda; color: #155724; padding: 3px 8px; border-radius: 3px; font-size: 0.85em; font-weight: 600;">NUEVO</span>'
-                    else:
-                        status_badge = '<span style="background: #fff3cd; color: #856404; padding: 3px 8px; border-radius: 3px; font-size: 0.85em; font-weight: 600;">ACTUALIZADO</span>'
-
-                    html += f"""
-                        <tr>
-                            <td>{status_badge}</td>
-                            <td class="package-name">{name}</td>
-                            <td>{old_version}</td>
-                            <td><strong>{new_version}</strong></td>
-                            <td>{size}</td>
-                            <td style="font-size: 0.9em; color: #666;">{detected_display}</td>
-                        </tr>
-"""
-
-                html += """
-                    </tbody>
-                </table>
-            </div>
-"""
-
-        html += """
-        </div>
-"""
-
-    # Latest packages section
-    html += """
-        <div class="section">
-            <h2>📦 Últimos Paquetes Actualizados</h2>
-            <div class="tabs">
-"""
-
-    for i, component in enumerate(components_data.keys()):
-        active = "active" if i == 0 else ""
-        html += f'<button class="tab {active}" onclick="showTab(\'latest-{component}\')">{component.capitalize()}</button>\n'
-
-    html += """
-            </div>
-"""
-
-    for i, (component, data) in enumerate(components_data.items()):
-        active = "active" if i == 0 else ""
-        html += f"""
-            <div id="latest-{component}" class="tab-content {active}">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Paquete</th>
-                            <th>Versión</th>
-                            <th>Arquitectura</th>
-                            <th>Tamaño</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-"""
-
-        for pkg in data['latest_packages'][:15]:
-            name = pkg.get('Package', 'N/A')
-            version = pkg.get('Version', 'N/A')
-            arch = pkg.get('Architecture', 'N/A')
-            size = format_size(int(pkg.get('Size', '0')))
-
-            html += f"""
-                        <tr>
-                            <td class="package-name">{name}</td>
-                            <td>{version}</td>
-                            <td>{arch}</td>
-                            <td>{size}</td>
-                        </tr>
-"""
-
-        html += """
-                    </tbody>
-                </table>
-            </div>
-"""
-
-    html += """
-        </div>
-
-        <div class="footer">
-            <p>Datos obtenidos de <a href="http://lliurex.net" target="_blank">lliurex.net</a></p>
-            <p>Generado automáticamente por GitHub Actions</p>
-        </div>
-    </div>
-
-    <script>
-        function showTab(tabId) {
-            // Hide all tab contents
-            document.querySelectorAll('.tab-content').forEach(content => {
-                content.classList.remove('active');
-            });
-
-            // Remove active class from all tabs
-            document.querySelectorAll('.tab').forEach(tab => {
-                tab.classList.remove('active');
-            });
-
-            // Show selected tab content
-            document.getElementById(tabId).classList.add('active');
-
-            // Add active class to clicked tab
-            event.target.classList.add('active');
-        }
-    </script>
-</body>
-</html>
-"""
-
-    return html
-
-def generate_index_page(versions_summary: Dict, status_data: Optional[Dict] = None) -> str:
-    """Generate main index.html page"""
-    html = """<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>LliureX - Monitor de Repositorios</title>
-    <style>
-        * {
+_INDEX_PAGE_CSS = """        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
@@ -1024,115 +1144,357 @@ def generate_index_page(versions_summary: Dict, status_data: Optional[Dict] = No
             background: #f8d7da;
             color: #721c24;
         }
-    </style>
+"""
+
+# Ubuntu release number and codename of each version, shared by both pages
+VERSION_NAMES = {
+    "focal": ("20.04", "Focal Fossa"),
+    "jammy": ("22.04", "Jammy Jellyfish"),
+    "noble": ("24.04", "Noble Numbat")
+}
+
+# Templates for the version page; only the placeholders are filled per call
+_VERSION_PAGE_HEAD_TPL = """<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>LliureX {title} - Repositorio de Paquetes</title>
+    <style>
+"""
+
+_VERSION_PAGE_INTRO_TPL = """    </style>
 </head>
 <body>
     <div class="container">
-        <header>
-            <h1>🐧 LliureX Repository Monitor</h1>
-            <p class="subtitle">Monitor de repositorios de paquetes LliureX para Ubuntu</p>
-            <p style="margin-top: 15px; color: #999;">Última actualización: """ + datetime.utcnow().strftime('%d/%m/%Y %H:%M UTC') + """</p>
-        </header>
-
-"""
+        <a href="index.html" class="back-link">← Volver al índice</a>
 
-    # Add status section if data is available
-    if status_data:
-        html += """        <div class="status-section">
-            <h2>📊 Estado de Conectividad</h2>
-            <div class="status-grid">
+        <h1>Ubuntu {version_name}</h1>
+        <p class="subtitle">Repositorio LliureX - Actualizado el {updated} UTC</p>
 """
 
-        # External status
-        if status_data.get('external'):
-            ext_data = status_data['external']
-            html += """                <div class="status-box">
-                    <h3>🌍 Estado Externo (GitHub Actions)</h3>
-"""
-            for version in UBUNTU_VERSIONS:
-                repo_info = ext_data.get('repos', {}).get(version, {})
-                status = repo_info.get('status', 'unknown')
-                status_badge = 'online' if status == 'online' else 'offline'
-                status_text = '✓ Online' if status == 'online' else '✗ Offline'
-
-                version_names = {
-                    'focal': '20.04 (Focal)',
-                    'jammy': '22.04 (Jammy)',
-                    'noble': '24.04 (Noble)'
-                }
-
-                html += f"""                    <div class="stat">
-                        <span class="stat-label">{version_names.get(version, version)}</span>
+_EXTERNAL_CONNECTIVITY_TPL = """
+                <div>
+                    <div class="connectivity-item">
+                        <span class="connectivity-label">🌍 Estado Externo</span>
                         <span class="status-badge {status_badge}">{status_text}</span>
                     </div>
-"""
-
-            html += f"""                    <div class="stat">
-                        <span class="stat-label">Última actualización</span>
-                        <span class="stat-value" style="font-size: 0.85em;">{ext_data.get('timestamp', 'N/A')}</span>
+                    <div class="connectivity-item">
+                        <span class="connectivity-label">Última verificación</span>
+                        <span style="font-size: 0.85em;">{timestamp}</span>
                     </div>
                 </div>
 """
 
-        # Local status
-        if status_data.get('local'):
-            local_data = status_data['local']
-            html += """                <div class="status-box">
-                    <h3>🏠 Estado Local (Red LliureX)</h3>
-"""
-            for version in UBUNTU_VERSIONS:
-                repo_info = local_data.get('repos', {}).get(version, {})
-                status = repo_info.get('status', 'unknown')
-                status_badge = 'online' if status == 'online' else 'offline'
-                status_text = '✓ Online' if status == 'online' else '✗ Offline'
-
-                version_names = {
-                    'focal': '20.04 (Focal)',
-                    'jammy': '22.04 (Jammy)',
-                    'noble': '24.04 (Noble)'
-                }
-
-                html += f"""                    <div class="stat">
-                        <span class="stat-label">{version_names.get(version, version)}</span>
+_LOCAL_CONNECTIVITY_TPL = """
+                <div>
+                    <div class="connectivity-item">
+                        <span class="connectivity-label">🏠 Estado Local</span>
                         <span class="status-badge {status_badge}">{status_text}</span>
                     </div>
-"""
-
-            html += f"""                    <div class="stat">
-                        <span class="stat-label">Servidor</span>
-                        <span class="stat-value" style="font-size: 0.85em;">{local_data.get('hostname', 'N/A')}</span>
+                    <div class="connectivity-item">
+                        <span class="connectivity-label">Servidor</span>
+                        <span style="font-size: 0.85em;">{hostname}</span>
                     </div>
-                    <div class="stat">
-                        <span class="stat-label">Última actualización</span>
-                        <span class="stat-value" style="font-size: 0.85em;">{local_data.get('timestamp', 'N/A')}</span>
+                    <div class="connectivity-item">
+                        <span class="connectivity-label">Última verificación</span>
+                        <span style="font-size: 0.85em;">{timestamp}</span>
                     </div>
                 </div>
 """
 
-        html += """            </div>
+_STAT_CARDS_TPL = """
+            <div class="stat-card">
+                <h3>Total de Paquetes</h3>
+                <div class="value">{total_packages}</div>
+            </div>
+            <div class="stat-card">
+                <h3>Tamaño Total</h3>
+                <div class="value">{total_size}</div>
+            </div>
+            <div class="stat-card">
+                <h3>Cambios Recientes</h3>
+                <div class="value">{total_changes}</div>
+            </div>
         </div>
+"""
 
+_TAB_BUTTON_TPL = '<button class="tab {active}" onclick="showTab(\'{tab_id}\')">{label}</button>\n'
+
+_CHANGES_TABLE_OPEN_TPL = """
+            <div id="changes-{component}" class="tab-content {active}">
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Estado</th>
+                            <th>Paquete</th>
+                            <th>Versión Anterior</th>
+                            <th>Versión Nueva</th>
+                            <th>Tamaño</th>
+                            <th>Detectado</th>
+                        </tr>
+                    </thead>
+                    <tbody>
 """
 
-    html += """        <div class="cards">
+_CHANGE_ROW_TPL = """
+                        <tr>
+                            <td>{status_badge}</td>
+                            <td class="package-name">{name}</td>
+                            <td>{old_version}</td>
+                            <td><strong>{new_version}</strong></td>
+                            <td>{size}</td>
+                            <td style="font-size: 0.9em; color: #666;">{detected}</td>
+                        </tr>
 """
 
-    version_names = {
-        "focal": ("Ubuntu 20.04 LTS", "Focal Fossa"),
-        "jammy": ("Ubuntu 22.04 LTS", "Jammy Jellyfish"),
-        "noble": ("Ubuntu 24.04 LTS", "Noble Numbat")
-    }
+_NEW_BADGE = '<span style="background: #d4edda; color: #155724; padding: 3px 8px; border-radius: 3px; font-size: 0.85em; font-weight: 600;">NUEVO</span>'
 
-    for version, summary in versions_summary.items():
-        name, codename = version_names.get(version, (version.capitalize(), ""))
-        status = "online" if summary.get('status') == 'online' else "offline"
-        status_text = "✓ Online" if status == "online" else "✗ Offline"
+_UPDATED_BADGE = '<span style="background: #fff3cd; color: #856404; padding: 3px 8px; border-radius: 3px; font-size: 0.85em; font-weight: 600;">ACTUALIZADO</span>'
 
-        total_packages = sum(data['total_packages'] for data in summary.get('components', {}).values())
-        total_size = sum(data['total_size'] for data in summary.get('components', {}).values())
-        total_changes = sum(len(data.get('recent_changes', [])) for data in summary.get('components', {}).values())
+_LATEST_TABLE_OPEN_TPL = """
+            <div id="latest-{component}" class="tab-content {active}">
+                <table>
+                    <thead>
+                        <tr>
+                            <th>Paquete</th>
+                            <th>Versión</th>
+                            <th>Arquitectura</th>
+                            <th>Tamaño</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+"""
+
+_LATEST_ROW_TPL = """
+                        <tr>
+                            <td class="package-name">{name}</td>
+                            <td>{version}</td>
+                            <td>{arch}</td>
+                            <td>{size}</td>
+                        </tr>
+"""
+
+_TABLE_CLOSE = """
+                    </tbody>
+                </table>
+            </div>
+"""
 
-        html += f"""
+_VERSION_PAGE_FOOTER = """
+        </div>
+
+        <div class="footer">
+            <p>Datos obtenidos de <a href="http://lliurex.net" target="_blank">lliurex.net</a></p>
+            <p>Generado automáticamente por GitHub Actions</p>
+        </div>
+    </div>
+
+    <script>
+        function showTab(tabId) {
+            // Hide all tab contents
+            document.querySelectorAll('.tab-content').forEach(content => {
+                content.classList.remove('active');
+            });
+
+            // Remove active class from all tabs
+            document.querySelectorAll('.tab').forEach(tab => {
+                tab.classList.remove('active');
+            });
+
+            // Show selected tab content
+            document.getElementById(tabId).classList.add('active');
+
+            // Add active class to clicked tab
+            event.target.classList.add('active');
+        }
+    </script>
+</body>
+</html>
+"""
+
+
+def format_detected_at(detected_at: str) -> str:
+    """Format a detection timestamp to be more readable"""
+    try:
+        if detected_at != 'N/A':
+            dt = datetime.fromisoformat(detected_at)
+            return dt.strftime("%d/%m/%Y %H:%M")
+        return 'N/A'
+    except:
+        return detected_at
+
+
+def _change_row(pkg: Dict) -> str:
+    """Render one row of the recent changes table, escaping every cell"""
+    return _CHANGE_ROW_TPL.format_map({
+        'status_badge': _NEW_BADGE if pkg.get('change_type', 'unknown') == 'new' else _UPDATED_BADGE,
+        'name': escape(pkg.get('Package', 'N/A')),
+        'old_version': escape(pkg.get('previous_version', '-')),
+        'new_version': escape(pkg.get('Version', 'N/A')),
+        'size': format_size(parse_size(pkg)),
+        'detected': escape(format_detected_at(pkg.get('detected_at', 'N/A')))
+    })
+
+
+def _latest_row(pkg: Dict) -> str:
+    """Render one row of the latest packages table, escaping every cell"""
+    return _LATEST_ROW_TPL.format_map({
+        'name': escape(pkg.get('Package', 'N/A')),
+        'version': escape(pkg.get('Version', 'N/A')),
+        'arch': escape(pkg.get('Architecture', 'N/A')),
+        'size': format_size(parse_size(pkg))
+    })
+
+
+def generate_html_page(version: str, summary: Dict, components_data: Dict, out: TextIO, status_data: Optional[Dict] = None,
+                       generated_at: Optional[datetime] = None):
+    """Write the HTML page for a specific Ubuntu version to out
+
+    Chunks are written as they are produced, so the page is never held in
+    memory as a whole. generated_at is the timestamp shown in the header;
+    pass the same value to every page of a run so they all agree.
+    """
+    write = out.write
+    if generated_at is None:
+        generated_at = datetime.now(timezone.utc)
+
+    write(_VERSION_PAGE_HEAD_TPL.format_map({'title': version.capitalize()}))
+    write(_VERSION_PAGE_CSS)
+    write(_VERSION_PAGE_INTRO_TPL.format_map({
+        'version_name': f"{VERSION_NAMES[version][0]} LTS ({VERSION_NAMES[version][1]})" if version in VERSION_NAMES else version.capitalize(),
+        'updated': generated_at.strftime('%d/%m/%Y %H:%M')
+    }))
+
+    # Add connectivity status if available
+    if status_data:
+        ext_status = None
+        local_status = None
+
+        if status_data.get('external'):
+            ext_data = status_data['external'].get('repos', {}).get(version, {})
+            if ext_data:
+                ext_status = ext_data.get('status', 'unknown')
+
+        if status_data.get('local'):
+            local_data = status_data['local'].get('repos', {}).get(version, {})
+            if local_data:
+                local_status = local_data.get('status', 'unknown')
+
+        if ext_status or local_status:
+            write("""
+        <div class="connectivity-section">
+            <h3>📡 Estado de Conectividad</h3>
+            <div class="connectivity-grid">
+""")
+
+            if ext_status:
+                write(_EXTERNAL_CONNECTIVITY_TPL.format_map({
+                    'status_badge': 'online' if ext_status == 'online' else 'offline',
+                    'status_text': '✓ Online' if ext_status == 'online' else '✗ Offline',
+                    'timestamp': status_data['external'].get('timestamp', 'N/A')
+                }))
+
+            if local_status:
+                write(_LOCAL_CONNECTIVITY_TPL.format_map({
+                    'status_badge': 'online' if local_status == 'online' else 'offline',
+                    'status_text': '✓ Online' if local_status == 'online' else '✗ Offline',
+                    'timestamp': status_data['local'].get('timestamp', 'N/A'),
+                    'hostname': status_data['local'].get('hostname', 'N/A')
+                }))
+
+            write("""
+            </div>
+        </div>
+""")
+
+    write("""
+        <div class="stats">
+""")
+
+    total_packages = 0
+    total_size = 0
+
+    total_changes = 0
+    for data in components_data.values():
+        total_packages += data['total_packages']
+        total_size += data['total_size']
+        total_changes += len(data['recent_changes'])
+
+    write(_STAT_CARDS_TPL.format_map({
+        'total_packages': total_packages,
+        'total_size': format_size(total_size),
+        'total_changes': total_changes
+    }))
+
+    # Recent changes section (if any)
+    if total_changes > 0:
+        write("""
+        <div class="section">
+            <h2>🔄 Cambios Desde la Última Actualización</h2>
+            <div class="tabs">
+""")
+
+        for i, component in enumerate(components_data.keys()):
+            if components_data[component]['recent_changes']:
+                write(_TAB_BUTTON_TPL.format_map({
+                    'active': "active" if i == 0 else "",
+                    'tab_id': f"changes-{component}",
+                    'label': component.capitalize()
+                }))
+
+        write("""
+            </div>
+""")
+
+        for i, (component, data) in enumerate(components_data.items()):
+            if data['recent_changes']:
+                write(_CHANGES_TABLE_OPEN_TPL.format_map({'component': component, 'active': "active" if i == 0 else ""}))
+
+                write(''.join(_change_row(pkg) for pkg in data['recent_changes'][:30]))
+
+                write(_TABLE_CLOSE)
+
+        write("""
+        </div>
+""")
+
+    # Latest packages section
+    write("""
+        <div class="section">
+            <h2>📦 Últimos Paquetes Actualizados</h2>
+            <div class="tabs">
+""")
+
+    for i, component in enumerate(components_data.keys()):
+        write(_TAB_BUTTON_TPL.format_map({
+            'active': "active" if i == 0 else "",
+            'tab_id': f"latest-{component}",
+            'label': component.capitalize()
+        }))
+
+    write("""
+            </div>
+""")
+
+    for i, (component, data) in enumerate(components_data.items()):
+        write(_LATEST_TABLE_OPEN_TPL.format_map({'component': component, 'active': "active" if i == 0 else ""}))
+
+        write(''.join(_latest_row(pkg) for pkg in data['latest_packages'][:15]))
+
+        write(_TABLE_CLOSE)
+
+    write(_VERSION_PAGE_FOOTER)
+
+
+# Templates for the index page
+_INDEX_STATUS_STAT_TPL = """                    <div class="stat">
+                        <span class="stat-label">{label}</span>
+                        <span class="status-badge {status_badge}">{status_text}</span>
+                    </div>
+"""
+
+_INDEX_CARD_TPL = """
             <div class="card">
                 <span class="status {status}">{status_text}</span>
                 <h2>{name}</h2>
@@ -1141,11 +1503,11 @@ def generate_index_page(versions_summary: Dict, status_data: Optional[Dict] = No
                 <div class="stats">
                     <div class="stat">
                         <span class="stat-label">📦 Paquetes totales</span>
-                        <span class="stat-value">{total_packages:,}</span>
+                        <span class="stat-value">{total_packages}</span>
                     </div>
                     <div class="stat">
                         <span class="stat-label">💾 Tamaño total</span>
-                        <span class="stat-value">{format_size(total_size)}</span>
+                        <span class="stat-value">{total_size}</span>
                     </div>
                     <div class="stat">
                         <span class="stat-label">🔄 Cambios recientes</span>
@@ -1157,7 +1519,28 @@ def generate_index_page(versions_summary: Dict, status_data: Optional[Dict] = No
             </div>
 """
 
-    html += """
+_INDEX_PAGE_HEAD = """<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>LliureX - Monitor de Repositorios</title>
+    <style>
+"""
+
+_INDEX_PAGE_HEADER_TPL = """    </style>
+</head>
+<body>
+    <div class="container">
+        <header>
+            <h1>🐧 LliureX Repository Monitor</h1>
+            <p class="subtitle">Monitor de repositorios de paquetes LliureX para Ubuntu</p>
+            <p style="margin-top: 15px; color: #999;">Última actualización: {updated}</p>
+        </header>
+
+"""
+
+_INDEX_PAGE_FOOTER = """
         </div>
 
         <footer>
@@ -1173,7 +1556,194 @@ def generate_index_page(versions_summary: Dict, status_data: Optional[Dict] = No
 </html>
 """
 
-    return html
+def _short_version_name(version: str) -> str:
+    """Short label of a version for the status boxes (e.g. '22.04 (Jammy)')"""
+    if version not in VERSION_NAMES:
+        return version
+    release, codename = VERSION_NAMES[version]
+    return f"{release} ({codename.split()[0]})"
+
+
+def _index_status_stat(version: str, status_data: Dict) -> str:
+    """Render the connectivity line of a version in a status box"""
+    status = status_data.get('repos', {}).get(version, {}).get('status', 'unknown')
+    return _INDEX_STATUS_STAT_TPL.format_map({
+        'label': _short_version_name(version),
+        'status_badge': 'online' if status == 'online' else 'offline',
+        'status_text': '✓ Online' if status == 'online' else '✗ Offline'
+    })
+
+
+def _index_card(version: str, summary: Dict) -> str:
+    """Render the card of a version in the index page"""
+    if version in VERSION_NAMES:
+        release, codename = VERSION_NAMES[version]
+        name = f"Ubuntu {release} LTS"
+    else:
+        name, codename = version.capitalize(), ""
+    status = "online" if summary.get('status') == 'online' else "offline"
+
+    total_packages = total_size = total_changes = 0
+    for data in summary['components'].values():
+        total_packages += data['total_packages']
+        total_size += data['total_size']
+        total_changes += len(data['recent_changes'])
+
+    return _INDEX_CARD_TPL.format_map({
+        'status': status,
+        'status_text': "✓ Online" if status == "online" else "✗ Offline",
+        'name': name,
+        'codename': codename,
+        'total_packages': f"{total_packages:,}",
+        'total_size': format_size(total_size),
+        'total_changes': total_changes,
+        'version': version
+    })
+
+
+def generate_index_page(versions_summary: Dict, out: TextIO, status_data: Optional[Dict] = None,
+                        generated_at: Optional[datetime] = None):
+    """Write the main index.html page to out"""
+    write = out.write
+    if generated_at is None:
+        generated_at = datetime.now(timezone.utc)
+    updated = generated_at.strftime('%d/%m/%Y %H:%M UTC')
+
+    write(_INDEX_PAGE_HEAD)
+    write(_INDEX_PAGE_CSS)
+    write(_INDEX_PAGE_HEADER_TPL.format_map({'updated': updated}))
+
+    # Add status section if data is available
+    if status_data:
+        write("""        <div class="status-section">
+            <h2>📊 Estado de Conectividad</h2>
+            <div class="status-grid">
+""")
+
+        # External status
+        if status_data.get('external'):
+            ext_data = status_data['external']
+            write("""                <div class="status-box">
+                    <h3>🌍 Estado Externo (GitHub Actions)</h3>
+""")
+            write(''.join([_index_status_stat(version, ext_data) for version in UBUNTU_VERSIONS]))
+
+            write(f"""                    <div class="stat">
+                        <span class="stat-label">Última actualización</span>
+                        <span class="stat-value" style="font-size: 0.85em;">{ext_data.get('timestamp', 'N/A')}</span>
+                    </div>
+                </div>
+""")
+
+        # Local status
+        if status_data.get('local'):
+            local_data = status_data['local']
+            write("""                <div class="status-box">
+                    <h3>🏠 Estado Local (Red LliureX)</h3>
+""")
+            write(''.join([_index_status_stat(version, local_data) for version in UBUNTU_VERSIONS]))
+
+            write(f"""                    <div class="stat">
+                        <span class="stat-label">Servidor</span>
+                        <span class="stat-value" style="font-size: 0.85em;">{local_data.get('hostname', 'N/A')}</span>
+                    </div>
+                    <div class="stat">
+                        <span class="stat-label">Última actualización</span>
+                        <span class="stat-value" style="font-size: 0.85em;">{local_data.get('timestamp', 'N/A')}</span>
+                    </div>
+                </div>
+""")
+
+        write("""            </div>
+        </div>
+
+""")
+
+    write("""        <div class="cards">
+""")
+
+    write(''.join([_index_card(version, summary) for version, summary in versions_summary.items()]))
+
+    write(_INDEX_PAGE_FOOTER)
+
+
+def load_published() -> Dict:
+    """Load the digests of the data saved to Firebase by previous runs"""
+    try:
+        with open(PUBLISHED_CACHE_FILE, "rb") as f:
+            content = f.read().strip()
+            if not content:
+                return {}
+            return loads_json(content)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_published(published: Dict):
+    """Save the digests of the data saved to Firebase"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    write_atomic(PUBLISHED_CACHE_FILE, dumps_json(published, indent=False))
+
+def write_if_changed(filename: str, payload: bytes) -> bool:
+    """Write payload to filename (atomically) unless the file already holds that exact content
+
+    Returns:
+        bool: True if the file was written
+    """
+    try:
+        with open(filename, "rb") as f:
+            if f.read() == payload:
+                return False
+    except FileNotFoundError:
+        pass
+    write_atomic(filename, payload)
+    return True
+
+def save_package_list(version: str, component: str, packages: List[Dict]) -> tuple[str, bytes, bool]:
+    """Save the full package list of a version/component to packages_{version}_{component}.json (compact)
+
+    Returns:
+        tuple: (filename, serialized payload, True if the file was written)
+    """
+    filename = f"packages_{version}_{component}.json"
+    payload = dumps_json(packages, indent=False)
+    return filename, payload, write_if_changed(filename, payload)
+
+def queue_firebase_update(updates: Dict, path: str, data, payload: bytes, published: Dict) -> bool:
+    """Queue data for Firebase unless the same payload was already saved to path
+
+    Args:
+        updates: Pending updates {path: (data, digest)}, saved by save_firebase_updates
+        path: Firebase path
+        data: Data to save
+        payload: Serialized data, used to detect unchanged content
+        published: Digests of the data saved by previous runs
+
+    Returns:
+        bool: True if the update was queued
+    """
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    if published.get(path) == digest:
+        return False
+    updates[path] = (data, digest)
+    return True
+
+def save_firebase_updates(updates: Dict, published: Dict) -> bool:
+    """Save all queued updates to Firebase in a single multi-path write
+
+    The digests are only recorded once the write succeeds, so a failed
+    upload is retried on the next run.
+
+    Returns:
+        bool: True if there was nothing to save or the write succeeded
+    """
+    if not updates:
+        return True
+    import firebase_config
+    if not firebase_config.save_many_to_firebase({path: data for path, (data, _) in updates.items()}):
+        return False
+    for path, (_, digest) in updates.items():
+        published[path] = digest
+    return True
 
 def sanitize_keys_for_firebase(data):
     """Recursively replace dots in keys with commas for Firebase compatibility"""
@@ -1191,9 +1761,16 @@ def main():
 
     # Load status data
     status_data = load_status_data()
+    # Single timestamp shown by every generated page
+    generated_at = datetime.now(timezone.utc)
 
     versions_summary = {}
-    all_packages_state = {}
+
+    print("Fetching packages indexes (including updates)...")
+    fetched = fetch_all_packages(UBUNTU_VERSIONS, COMPONENTS)
+    published = load_published()
+    # Read once, updated by every component comparison and saved once below
+    all_timestamps = load_change_timestamps()
 
     for version in UBUNTU_VERSIONS:
         print(f"\n{'='*60}")
@@ -1201,51 +1778,47 @@ def main():
         print('='*60)
 
         components_data = {}
-        all_packages_state[version] = {}
-
         for component in COMPONENTS:
-            print(f"\nFetching {component} packages (including updates):")
-            
-            # Fetch from base, updates, and security
-            dists_to_check = [version, f"{version}-updates", f"{version}-security"]
-            combined_packages = []
-            latest_modified = None
-
-            for dist in dists_to_check:
-                packages, repo_last_modified = fetch_packages_for_version(version, dist, component)
-                if packages:
-                    combined_packages.extend(packages)
-                    # Keep the most recent timestamp found
-                    if repo_last_modified:
-                        if not latest_modified or repo_last_modified > latest_modified:
-                            latest_modified = repo_last_modified
+            print(f"\n{component} packages:")
+
+            combined_packages, latest_modified, content_hash = fetched.get((version, component), ({}, None, None))
 
             if combined_packages:
                 if latest_modified:
                     print(f"  Repository last modified (newest): {latest_modified}")
-                
-                summary = get_package_summary(combined_packages, version, component, latest_modified)
+
+                # Reuse last run's summary if neither the indexes nor the
+                # previous state they are compared to have changed
+                summary = None
+                cache_key = None
+                if content_hash:
+                    cache_key = summary_cache_key(content_hash, load_previous_packages(version, component))
+                    summary = load_cached_summary(version, component, cache_key)
+                if summary is not None:
+                    print("  ✓ Unchanged since last run, using cached summary")
+                else:
+                    summary = get_package_summary(combined_packages, version, component, latest_modified, all_timestamps)
+                    summary['content_hash'] = content_hash
+                    if cache_key:
+                        save_cached_summary(version, component, cache_key, summary)
                 components_data[component] = summary
 
-                # Store current state
-                all_packages_state[version][component] = summary['packages_dict']
+                # Store current state for next run (internal format for comparison)
+                if save_packages_state(version, component, summary['packages_dict']):
+                    print(f"  ✓ Saved {packages_state_file(version, component)} (for change detection)")
 
                 # Show summary with changes
                 changes_count = len(summary['recent_changes'])
+                print(f"  Summary: {summary['total_packages']} unique packages, {format_size(summary['total_size'])}")
                 if changes_count > 0:
-                    new_count = len([c for c in summary['recent_changes'] if c.get('change_type') == 'new'])
-                    updated_count = len([c for c in summary['recent_changes'] if c.get('change_type') == 'updated'])
-                    print(f"  Summary: {summary['total_packages']} unique packages, {format_size(summary['total_size'])}")
-                    print(f"  Changes: {new_count} new, {updated_count} updated")
-                else:
-                    print(f"  Summary: {summary['total_packages']} unique packages, {format_size(summary['total_size'])}")
+                    change_types = Counter(c.get('change_type') for c in summary['recent_changes'])
+                    print(f"  Changes: {change_types['new']} new, {change_types['updated']} updated")
 
         if components_data:
             # HTML generation removed - pages now load data dynamically via JavaScript
             # print(f"\n📝 Generating HTML page for {version}...")
-            # html = generate_html_page(version, None, components_data, status_data)
-            # with open(f"{version}.html", "w", encoding='utf-8') as f:
-            #     f.write(html)
+            # with open(f"{version}.html", "w", encoding='utf-8', buffering=1 << 16) as f:
+            #     generate_html_page(version, None, components_data, f, status_data, generated_at)
 
             versions_summary[version] = {
                 'status': 'online',
@@ -1258,69 +1831,79 @@ def main():
                 'components': {}
             }
 
-    # Save current packages state for next run (internal format for comparison)
-    print(f"\n{'='*60}")
-    print("💾 Saving packages state...")
-    print('='*60)
-    with open("packages_state_internal.json", "w") as f:
-        json.dump(all_packages_state, f, indent=2)
-    print("  ✓ Saved packages_state_internal.json (for change detection)")
+    if save_change_timestamps(all_timestamps):
+        print("\n  ✓ Saved changes_timestamps.json")
 
     # Save versions summary for JavaScript pages (public format)
     # Create lightweight version without full package lists
     versions_summary_light = {}
+    package_lists = []
     for version, data in versions_summary.items():
         versions_summary_light[version] = {
-            'status': data.get('status'),
+            'status': data['status'],
             'components': {}
         }
-        for comp_name, comp_data in data.get('components', {}).items():
+        for comp_name, comp_data in data['components'].items():
             versions_summary_light[version]['components'][comp_name] = {
-                'total_packages': comp_data.get('total_packages'),
-                'total_size': comp_data.get('total_size'),
-                'recent_changes': comp_data.get('recent_changes'),
-                'latest_packages': comp_data.get('latest_packages'),
-                'largest_packages': comp_data.get('largest_packages')
+                'total_packages': comp_data['total_packages'],
+                'total_size': comp_data['total_size'],
+                'recent_changes': comp_data['recent_changes'],
+                'latest_packages': comp_data['latest_packages'],
+                'largest_packages': comp_data['largest_packages'],
+                'content_hash': comp_data.get('content_hash')
             }
-            # Save full package list in separate file per version-component
-            packages = comp_data.get('packages', [])
+            # Full package list goes in a separate file per version-component
+            packages = comp_data['packages']
             if packages:
-                filename = f"packages_{version}_{comp_name}.json"
-                with open(filename, "w") as pf:
-                    json.dump(packages, pf, indent=2)
-                print(f"  ✓ Saved {filename} ({len(packages)} packages)")
-                
-                # Save full list to Firebase (under a separate node to avoid loading it with the summary)
-                try:
-                    import firebase_config
-                    firebase_config.save_to_firebase(f"packages_full/{version}/{comp_name}", packages)
-                except Exception as e:
-                    print(f"  ⚠️ Could not save {filename} to Firebase: {e}")
-
-    with open("packages_state.json", "w") as f:
-        json.dump(versions_summary_light, f, indent=2)
-    print("  ✓ Saved packages_state.json (for web pages)")
-    
-    # Save to Firebase
-    import firebase_config
-    firebase_config.save_to_firebase('packages_state', versions_summary_light)
-    
+                package_lists.append((version, comp_name, packages))
+
+    # Changed Firebase nodes, saved together at the end
+    firebase_updates = {}
+
+    # The package list files are independent: serialize and write them
+    # concurrently, then report and upload them in order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        saved = list(executor.map(lambda item: save_package_list(*item), package_lists))
+
+    for (version, comp_name, packages), (filename, payload, written) in zip(package_lists, saved):
+        if written:
+            print(f"  ✓ Saved {filename} ({len(packages)} packages)")
+        else:
+            print(f"  ✓ {filename} unchanged, skipped")
+
+        # Full list goes to Firebase under a separate node to avoid loading it with the summary
+        queue_firebase_update(firebase_updates, f"packages_full/{version}/{comp_name}", packages, payload, published)
+
+    payload = dumps_json(versions_summary_light)
+    if write_if_changed("packages_state.json", payload):
+        print("  ✓ Saved packages_state.json (for web pages)")
+    else:
+        print("  ✓ packages_state.json unchanged, skipped")
+
+    queue_firebase_update(firebase_updates, 'packages_state', versions_summary_light, payload, published)
+
     # Save timestamps to Firebase (needed for version.html)
     try:
-        all_timestamps = load_change_timestamps()
         # Sanitize keys (replace . with ,) because Firebase doesn't allow . in keys
         sanitized_timestamps = sanitize_keys_for_firebase(all_timestamps)
-        firebase_config.save_to_firebase('changes_timestamps', sanitized_timestamps)
+        queue_firebase_update(firebase_updates, 'changes_timestamps', sanitized_timestamps, dumps_json(sanitized_timestamps, indent=False), published)
     except Exception as e:
         print(f"  ⚠️ Could not save changes_timestamps to Firebase: {e}")
 
+    # Save every changed node to Firebase in one request
+    try:
+        save_firebase_updates(firebase_updates, published)
+    except Exception as e:
+        print(f"  ⚠️ Could not save to Firebase: {e}")
+
+    save_published(published)
+
     # HTML generation removed - pages now load data dynamically via JavaScript
     # print(f"\n{'='*60}")
     # print("📝 Generating index.html...")
     # print('='*60)
-    # index_html = generate_index_page(versions_summary, status_data)
-    # with open("index.html", "w", encoding='utf-8') as f:
-    #     f.write(index_html)
+    # with open("index.html", "w", encoding='utf-8', buffering=1 << 16) as f:
+    #     generate_index_page(versions_summary, f, status_data, generated_at)
     # print("  ✓ Created index.html")
 
     print("\n✅ Package data processing completed!")
@@ -1333,4 +1916,7 @@ def main():
         print(f"  - {version}.html")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        SESSION.close()
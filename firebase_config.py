@@ -1,25 +1,76 @@
-import firebase_admin
-from firebase_admin import credentials, db
 import os
 import json
+from functools import lru_cache
 
 import re
 
+# firebase_admin (and its google-cloud/grpc dependencies) is slow to import,
+# so it is only imported by the first initialize_firebase() call
+firebase_admin = credentials = db = None
+
+# databaseURL entry of the frontend Firebase config
+_DB_URL_RE = re.compile(r'databaseURL:\s*["\']([^"\']+)["\']')
+
+@lru_cache(maxsize=1)
 def get_frontend_db_url():
-    """Try to extract databaseURL from firebase_frontend_config.js"""
+    """Try to extract databaseURL from firebase_frontend_config.js (read once per process)"""
     try:
         if os.path.exists('firebase_frontend_config.js'):
             with open('firebase_frontend_config.js', 'r') as f:
                 content = f.read()
-                match = re.search(r'databaseURL:\s*["\']([^"\']+)["\']', content)
+                match = _DB_URL_RE.search(content)
                 if match:
                     return match.group(1)
     except:
         pass
     return None
 
+@lru_cache(maxsize=1)
+def get_credentials():
+    """Load the service account credentials (once per process)
+
+    Returns:
+        credentials.Certificate or None if no credentials are configured
+    """
+    # 1. Try environment variable with JSON content (GitHub Actions style)
+    key_json = os.environ.get('FIREBASE_KEY_JSON')
+    if key_json:
+        try:
+            return credentials.Certificate(json.loads(key_json))
+        except json.JSONDecodeError:
+            print("Error: FIREBASE_KEY_JSON is not valid JSON")
+            return None
+
+    # 2. Try local file
+    if os.path.exists('serviceAccountKey.json'):
+        return credentials.Certificate('serviceAccountKey.json')
+
+    return None
+
+# Outcome of the first initialize_firebase() call (None until then)
+_FIREBASE_READY = None
+
 def initialize_firebase():
-    """Initialize Firebase Admin SDK"""
+    """Initialize Firebase Admin SDK
+
+    The outcome is remembered, so later calls return at once (and a missing
+    configuration is only reported once per run).
+    """
+    global _FIREBASE_READY
+    if _FIREBASE_READY is None:
+        _FIREBASE_READY = _initialize_firebase()
+    return _FIREBASE_READY
+
+def _initialize_firebase():
+    """Initialize Firebase Admin SDK (does the actual work of initialize_firebase)"""
+    global firebase_admin, credentials, db
+    try:
+        import firebase_admin
+        from firebase_admin import credentials, db
+    except ImportError:
+        print("⚠️ Warning: firebase_admin is not installed. Skipping Firebase updates.")
+        return False
+
     try:
         # Check if app is already initialized
         firebase_admin.get_app()
@@ -27,21 +78,7 @@ def initialize_firebase():
     except ValueError:
         pass # Not initialized
 
-    # Try to get credentials
-    cred = None
-    
-    # 1. Try environment variable with JSON content (GitHub Actions style)
-    if os.environ.get('FIREBASE_KEY_JSON'):
-        try:
-            key_dict = json.loads(os.environ['FIREBASE_KEY_JSON'])
-            cred = credentials.Certificate(key_dict)
-        except json.JSONDecodeError:
-            print("Error: FIREBASE_KEY_JSON is not valid JSON")
-
-    # 2. Try local file
-    elif os.path.exists('serviceAccountKey.json'):
-        cred = credentials.Certificate('serviceAccountKey.json')
-        
+    cred = get_credentials()
     if cred:
         # Initialize with database URL
         # Priority:
@@ -88,6 +125,28 @@ def save_to_firebase(path, data):
         print(f"❌ Error saving to Firebase: {e}")
         return False
 
+def save_many_to_firebase(updates):
+    """Save data to several paths in Firebase Realtime Database at once
+
+    All paths are written in a single multi-location update (one request,
+    applied atomically), instead of one ref.set() per path.
+
+    Args:
+        updates: Dictionary {path: data}
+    """
+    if not updates:
+        return True
+    if not initialize_firebase():
+        return False
+
+    try:
+        db.reference('/').update(updates)
+        print(f"✅ Saved data to Firebase: {', '.join(updates)}")
+        return True
+    except Exception as e:
+        print(f"❌ Error saving to Firebase: {e}")
+        return False
+
 def push_to_firebase(path, data):
     """Push new item to a list in Firebase Realtime Database"""
     if not initialize_firebase():
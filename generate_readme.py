@@ -7,19 +7,25 @@ and generates a unified README.md
 import json
 import subprocess
 import os
+from functools import lru_cache
 from typing import Dict, Optional
 
+VERSION_NAMES = {
+    "focal": "20.04 LTS",
+    "jammy": "22.04 LTS",
+    "noble": "24.04 LTS"
+}
+
 def get_version_name(codename: str) -> str:
     """Get Ubuntu version number from codename"""
-    versions = {
-        "focal": "20.04 LTS",
-        "jammy": "22.04 LTS",
-        "noble": "24.04 LTS"
-    }
-    return versions.get(codename, codename)
+    return VERSION_NAMES.get(codename, codename)
 
+@lru_cache(maxsize=1)
 def get_github_repo() -> str:
-    """Get GitHub repository from git remote or environment variable"""
+    """Get GitHub repository from git remote or environment variable
+
+    The result is memoized, so git is only run once per process.
+    """
     # Try from environment (GitHub Actions)
     github_repo = os.environ.get('GITHUB_REPOSITORY')
     if github_repo:
@@ -80,16 +86,7 @@ def load_local_status() -> Optional[Dict]:
         pass
     return None
 
-def generate_readme() -> str:
-    """Generate README.md content from status files"""
-    github_repo = get_github_repo()
-    github_user = github_repo.split('/')[0]
-    github_project = github_repo.split('/')[1]
-
-    external_status = load_external_status()
-    local_status = load_local_status()
-
-    readme = f"""# LliureX Repository Status
+_README_TEMPLATE = """# LliureX Repository Status
 
 [![Check Status](https://github.com/{github_repo}/actions/workflows/check-status.yml/badge.svg)](https://github.com/{github_repo}/actions/workflows/check-status.yml)
 [![Update Packages](https://github.com/{github_repo}/actions/workflows/update-packages.yml/badge.svg)](https://github.com/{github_repo}/actions/workflows/update-packages.yml)
@@ -100,62 +97,7 @@ Este repositorio monitorea automáticamente el estado de los repositorios de Lli
 
 ## 📊 Estado Actual
 
-"""
-
-    # Add external status section
-    if external_status:
-        readme += f"""### 🌍 Estado Externo (GitHub Actions)
-
-**Última actualización:** {external_status['timestamp']} UTC
-
-"""
-        readme += "| Versión Ubuntu | Estado | Última Actualización Repo | URL |\n"
-        readme += "|----------------|--------|---------------------------|-----|\n"
-
-        for repo_name, info in sorted(external_status["repos"].items()):
-            status_emoji = "✅" if info["status"] == "online" else "❌"
-            version_name = get_version_name(repo_name)
-            url = info.get("url", "")
-            last_update = info.get("last_update", "N/A")
-
-            readme += f"| Ubuntu {version_name} ({repo_name}) | {status_emoji} {info['status']} | {last_update} | [Link]({url}) |\n"
-    else:
-        readme += """### 🌍 Estado Externo (GitHub Actions)
-
-_No hay datos de verificación externa disponibles._
-
-"""
-
-    # Add local status section
-    if local_status:
-        readme += f"""
-
-### 🏠 Estado Local (Red LliureX)
-
-**Última actualización:** {local_status['timestamp']} UTC
-**Servidor:** {local_status.get('hostname', 'N/A')}
-
-"""
-        readme += "| Versión Ubuntu | Estado | Última Actualización Repo | URL |\n"
-        readme += "|----------------|--------|---------------------------|-----|\n"
-
-        for repo_name, info in sorted(local_status["repos"].items()):
-            status_emoji = "✅" if info["status"] == "online" else "❌"
-            version_name = get_version_name(repo_name)
-            url = info.get("url", "")
-            last_update = info.get("last_update", "N/A")
-
-            readme += f"| Ubuntu {version_name} ({repo_name}) | {status_emoji} {info['status']} | {last_update} | [Link]({url}) |\n"
-    else:
-        readme += """
-
-### 🏠 Estado Local (Red LliureX)
-
-_No hay datos de verificación local disponibles. Ejecuta `update_status_local.py` desde la red local para obtener esta información._
-
-"""
-
-    readme += """
+{external_section}{local_section}
 
 ## 📦 Repositorios de LliureX
 
@@ -201,12 +143,108 @@ Este proyecto es de código abierto y está disponible bajo la licencia MIT.
 *Generado automáticamente por GitHub Actions*
 """
 
-    return readme
+_TABLE_HEADER = """| Versión Ubuntu | Estado | Última Actualización Repo | URL |
+|----------------|--------|---------------------------|-----|
+"""
+
+_EXTERNAL_SECTION_TPL = """### 🌍 Estado Externo (GitHub Actions)
+
+**Última actualización:** {timestamp} UTC
+
+""" + _TABLE_HEADER + "{rows}"
+
+_NO_EXTERNAL_SECTION = """### 🌍 Estado Externo (GitHub Actions)
+
+_No hay datos de verificación externa disponibles._
+
+"""
+
+_LOCAL_SECTION_TPL = """
+
+### 🏠 Estado Local (Red LliureX)
+
+**Última actualización:** {timestamp} UTC
+**Servidor:** {hostname}
+
+""" + _TABLE_HEADER + "{rows}"
+
+_NO_LOCAL_SECTION = """
+
+### 🏠 Estado Local (Red LliureX)
+
+_No hay datos de verificación local disponibles. Ejecuta `update_status_local.py` desde la red local para obtener esta información._
+
+"""
+
+def status_rows(repos: Dict) -> str:
+    """Build the status table rows of a set of repositories
+
+    The status scripts store the repos in UBUNTU_VERSIONS order (oldest
+    release first), so they are listed as stored.
+    """
+    rows = []
+    for repo_name, info in repos.items():
+        status_emoji = "✅" if info["status"] == "online" else "❌"
+        version_name = get_version_name(repo_name)
+        url = info.get("url", "")
+        last_update = info.get("last_update", "N/A")
+
+        rows.append(f"| Ubuntu {version_name} ({repo_name}) | {status_emoji} {info['status']} | {last_update} | [Link]({url}) |\n")
+    return ''.join(rows)
+
+def generate_readme(external_status: Optional[Dict] = None,
+                    local_status: Optional[Dict] = None) -> str:
+    """Generate README.md content from status files
+
+    Args:
+        external_status: Latest external status, if the caller already has
+            it in memory (otherwise read from history.json)
+        local_status: Latest local status (otherwise read from local_status.json)
+
+    Returns:
+        README.md content
+    """
+    github_repo = get_github_repo()
+    github_user = github_repo.split('/')[0]
+    github_project = github_repo.split('/')[1]
+
+    if external_status is None:
+        external_status = load_external_status()
+    if local_status is None:
+        local_status = load_local_status()
 
-def main():
+    # Add external status section
+    if external_status:
+        external_section = _EXTERNAL_SECTION_TPL.format_map({
+            'timestamp': external_status['timestamp'],
+            'rows': status_rows(external_status["repos"])
+        })
+    else:
+        external_section = _NO_EXTERNAL_SECTION
+
+    # Add local status section
+    if local_status:
+        local_section = _LOCAL_SECTION_TPL.format_map({
+            'timestamp': local_status['timestamp'],
+            'hostname': local_status.get('hostname', 'N/A'),
+            'rows': status_rows(local_status["repos"])
+        })
+    else:
+        local_section = _NO_LOCAL_SECTION
+
+    return _README_TEMPLATE.format_map({
+        'github_repo': github_repo,
+        'github_user': github_user,
+        'github_project': github_project,
+        'external_section': external_section,
+        'local_section': local_section
+    })
+
+def main(external_status: Optional[Dict] = None, local_status: Optional[Dict] = None):
+    """Write README.md (see generate_readme for the arguments)"""
     print("📝 Generating README.md from status files...")
 
-    readme_content = generate_readme()
+    readme_content = generate_readme(external_status, local_status)
 
     with open("README.md", "w") as f:
         f.write(readme_content)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+JSON helpers shared by every script (orjson when available, json otherwise)
+"""
+import json
+import os
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_json(obj, indent: bool = True, sort_keys: bool = False) -> bytes:
+    """Serialize obj as JSON bytes (with orjson when available)
+
+    Both paths write non-ASCII text as UTF-8, so the files are the same
+    whichever library is installed.
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with 2 spaces (files kept in the repo); compact
+            output is used for files only read back by the scripts
+        sort_keys: Sort object keys (for stable digests)
+    """
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return (json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys) + "\n").encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys, separators=(',', ':')).encode('utf-8')
+
+def loads_json(data: bytes):
+    """Parse JSON bytes (with orjson when available)"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def write_atomic(filename: str, payload: bytes):
+    """Write payload to filename through a temporary file and os.replace
+
+    Readers (and the next run, if this one is interrupted) see either the
+    old or the new content, never a partially written file. The temporary
+    name includes the thread id since index fetches save in parallel.
+    """
+    tmp_path = f"{filename}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb", buffering=1 << 16) as f:
+            f.write(payload)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Shared LliureX repository checks used by update_status.py (external)
+and update_status_local.py (local network)
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import Dict, Optional
+import hashlib
+import os
+import re
+import threading
+
+from jsonio import dumps_json, loads_json, write_atomic
+
+LLIUREX_BASE_URL = "http://lliurex.net"
+UBUNTU_VERSIONS = [
+    "jammy",    # Ubuntu 22.04 LTS
+    "noble",    # Ubuntu 24.04 LTS
+]
+
+# Fields read from the Release file
+_DATE_RE = re.compile(r'Date:\s*(.+)')
+_PACKAGES_COUNT_RE = re.compile(r'(\d+)\s+main/binary')
+
+# Validators and parsed fields of the last Release file served per version,
+# so unchanged files are answered with a 304 and no body
+STATE_DIR = "state"
+RELEASE_CACHE_FILE = os.path.join(STATE_DIR, "release_cache.json")
+
+def create_session() -> requests.Session:
+    """Create the shared HTTP session (keep-alive pool for all the checks)
+
+    Connection and read errors are retried, but HTTP error replies are not
+    (no status_forcelist), so they are still reported as is.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.3)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "User-Agent": "lliurex-state/1.0"
+    })
+    return session
+
+# Created on first use, so importing the constants opens no connection pool
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session, creating it on first use"""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = create_session()
+        return _SESSION
+
+def close_session():
+    """Close the shared HTTP session if it was created"""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+
+def load_release_cache() -> Dict:
+    """Load the Release validators saved by the previous run
+
+    Returns:
+        Dictionary {version: cached Release info}, empty if there is none
+    """
+    try:
+        with open(RELEASE_CACHE_FILE, "rb") as f:
+            return loads_json(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def save_release_cache(release_cache: Dict):
+    """Save the Release validators for the next run"""
+    os.makedirs(STATE_DIR, exist_ok=True)
+    write_atomic(RELEASE_CACHE_FILE, dumps_json(release_cache))
+
+def fetch_repo_info(version: str, release_cache: Optional[Dict] = None) -> Dict:
+    """Fetch information from a specific Ubuntu version repository
+
+    The Release file is requested first: if it is served the repository is
+    online, so the directory itself only needs checking (with a HEAD) when
+    it is not.
+
+    Args:
+        version: Ubuntu version name
+        release_cache: Release validators by version (see load_release_cache).
+            The request is made conditional on them, and the entry of this
+            version is updated in place when a new Release file is served.
+    """
+    url = f"{LLIUREX_BASE_URL}/{version}/"
+    cached = release_cache.get(version) if release_cache is not None else None
+    session = get_session()
+
+    try:
+        release_url = f"{url}dists/{version}/Release"
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        release_response = session.get(release_url, timeout=10, headers=headers)
+
+        packages_count = "N/A"
+        last_update = "N/A"
+        content_hash = None
+
+        if release_response.status_code == 304 and cached:
+            # Not modified since the previous run: reuse what was parsed then
+            last_update = cached["last_update"]
+            packages_count = cached["packages"]
+            content_hash = cached["content_hash"]
+        elif release_response.status_code == 200:
+            release_content = release_response.text
+            # The Release file lists the checksums of every index, so its
+            # digest changes whenever any of them does
+            content_hash = hashlib.blake2b(release_response.content, digest_size=16).hexdigest()
+            # Extract date from Release file
+            date_match = _DATE_RE.search(release_content)
+            if date_match:
+                last_update = date_match.group(1).strip()
+
+            # Count packages from Packages files
+            packages_match = _PACKAGES_COUNT_RE.findall(release_content)
+            if packages_match:
+                packages_count = sum(int(x) for x in packages_match)
+
+            if release_cache is not None:
+                etag = release_response.headers.get("ETag")
+                last_modified = release_response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    release_cache[version] = {
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "last_update": last_update,
+                        "packages": packages_count,
+                        "content_hash": content_hash
+                    }
+                else:
+                    release_cache.pop(version, None)
+        else:
+            response = session.head(url, timeout=10, allow_redirects=True)
+            if response.status_code != 200:
+                return {
+                    "status": "error",
+                    "url": url,
+                    "http_code": response.status_code,
+                    "error": f"HTTP {response.status_code}"
+                }
+
+        return {
+            "status": "online",
+            "url": url,
+            "last_update": last_update,
+            "packages": packages_count,
+            "content_hash": content_hash,
+            "http_code": 200
+        }
+    except Exception as e:
+        return {
+            "status": "offline",
+            "url": url,
+            "error": str(e)
+        }
+
+def fetch_all_repos(source: str, extra: Optional[Dict] = None, location: str = "") -> Dict:
+    """Fetch information from all repositories
+
+    Args:
+        source: Value of the "source" field ("github-actions" or "local")
+        extra: Additional top-level fields (e.g. the hostname), placed
+            before "repos"
+        location: Suffix for the progress messages
+
+    Returns:
+        Status record with the timestamp and the info of every version
+    """
+    repo_data = {
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+        "source": source,
+    }
+    if extra:
+        repo_data.update(extra)
+
+    release_cache = load_release_cache()
+    previous_cache = dict(release_cache)
+
+    # The versions are independent, check them concurrently (each one only
+    # touches its own release_cache entry)
+    for version in UBUNTU_VERSIONS:
+        print(f"Checking {version}{location}...")
+    with ThreadPoolExecutor(max_workers=len(UBUNTU_VERSIONS)) as executor:
+        fetch = partial(fetch_repo_info, release_cache=release_cache)
+        repo_data["repos"] = dict(zip(UBUNTU_VERSIONS, executor.map(fetch, UBUNTU_VERSIONS)))
+
+    if release_cache != previous_cache:
+        try:
+            save_release_cache(release_cache)
+        except OSError as e:
+            print(f"Warning: Could not save {RELEASE_CACHE_FILE}: {e}")
+
+    return repo_data
@@ -20,7 +20,7 @@ echo "Fetching package information..." >> "$LOG_FILE"
 python3 fetch_packages.py >> "$LOG_FILE" 2>&1
 
 # Check if there are actual changes in package files
-# Note: packages_state_internal.json is in .gitignore, so we don't check it
+# Note: the internal state files (state/) are in .gitignore, so we don't check them
 if git diff --quiet packages_state.json changes_timestamps.json 2>/dev/null && \
    git diff --quiet packages_jammy_main.json packages_noble_main.json 2>/dev/null; then
     echo "✓ No changes detected in packages - skipping commit" >> "$LOG_FILE"
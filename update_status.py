@@ -3,90 +3,17 @@
 Script to fetch LliureX repository status from external (GitHub Actions)
 and update history.json
 """
-import requests
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
-import json
-import re
-import subprocess
-import os
-import sys
 
-LLIUREX_BASE_URL = "http://lliurex.net"
-UBUNTU_VERSIONS = [
-    "jammy",    # Ubuntu 22.04 LTS
-    "noble",    # Ubuntu 24.04 LTS
-]
-
-def fetch_repo_info(version: str) -> Dict:
-    """Fetch information from a specific Ubuntu version repository"""
-    url = f"{LLIUREX_BASE_URL}/{version}/"
-
-    try:
-        response = requests.get(url, timeout=10)
-
-        if response.status_code == 200:
-            content = response.text
-
-            # Try to find Release file to get more info
-            release_url = f"{url}dists/{version}/Release"
-            release_response = requests.get(release_url, timeout=10)
-
-            packages_count = "N/A"
-            last_update = "N/A"
-
-            if release_response.status_code == 200:
-                release_content = release_response.text
-                # Extract date from Release file
-                date_match = re.search(r'Date:\s*(.+)', release_content)
-                if date_match:
-                    last_update = date_match.group(1).strip()
-
-                # Count packages from Packages files
-                packages_match = re.findall(r'(\d+)\s+main/binary', release_content)
-                if packages_match:
-                    packages_count = sum(int(x) for x in packages_match)
-
-            return {
-                "status": "online",
-                "url": url,
-                "last_update": last_update,
-                "packages": packages_count,
-                "http_code": 200
-            }
-        else:
-            return {
-                "status": "error",
-                "url": url,
-                "http_code": response.status_code,
-                "error": f"HTTP {response.status_code}"
-            }
-    except Exception as e:
-        return {
-            "status": "offline",
-            "url": url,
-            "error": str(e)
-        }
-
-def fetch_all_repos() -> Dict:
-    """Fetch information from all repositories"""
-    repo_data = {
-        "timestamp": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-        "source": "github-actions",
-        "repos": {}
-    }
-
-    for version in UBUNTU_VERSIONS:
-        print(f"Checking {version}...")
-        repo_data["repos"][version] = fetch_repo_info(version)
-
-    return repo_data
+import jsonio
+import lliurex_fetch
 
 def save_history(repo_data: Dict):
     """Save historical data"""
     try:
-        with open("history.json", "r") as f:
-            history = json.load(f)
+        with open("history.json", "rb") as f:
+            history = jsonio.loads_json(f.read())
     except FileNotFoundError:
         history = []
 
@@ -96,27 +23,48 @@ def save_history(repo_data: Dict):
     if len(history) > 30:
         history = history[-30:]
 
-    with open("history.json", "w") as f:
-        json.dump(history, f, indent=2)
+    # The frontend falls back to fetching history.json as a JSON array, so
+    # it stays a bounded array (not an append-only log) replaced atomically.
+    # It is written first, so a Firebase failure never loses the local history
+    jsonio.write_atomic("history.json", jsonio.dumps_json(history))
 
     # Save to Firebase
     import firebase_config
+    # Initialized here, before the worker threads: the first call is the
+    # one that sets up the app and must not run twice concurrently
+    try:
+        firebase_config.initialize_firebase()
+    except Exception as e:
+        print(f"❌ Error initializing Firebase: {e}")
+        return
     # We push the single new entry, not the whole history array (to act as a log)
     # But wait, the frontend might want the last X entries.
     # If we use push(), we get unique IDs.
     # Let's also update a 'latest_status' node for easy access.
-    firebase_config.push_to_firebase('history', repo_data)
-    firebase_config.save_to_firebase('latest_status', repo_data)
+    # Both requests are independent, so they run concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(firebase_config.push_to_firebase, 'history', repo_data),
+            executor.submit(firebase_config.save_to_firebase, 'latest_status', repo_data)
+        ]
+    for future in futures:
+        try:
+            future.result()
+        except Exception as e:
+            print(f"❌ Error saving to Firebase: {e}")
 
 def main():
     print("🔍 Fetching LliureX repository status (external)...")
-    repo_data = fetch_all_repos()
+    repo_data = lliurex_fetch.fetch_all_repos("github-actions")
 
     print("💾 Saving external status to history.json...")
     save_history(repo_data)
 
     print("📝 Regenerating README.md...")
-    subprocess.run([sys.executable, "generate_readme.py"], check=True)
+    # In-process instead of a new interpreter; the entry just saved is the
+    # latest one of history.json, so it is passed instead of re-read
+    import generate_readme
+    generate_readme.main(external_status=repo_data)
 
     print("\n✅ External status update completed!")
 
@@ -130,4 +78,7 @@ def main():
         print(f"   {status} {repo_name}: {info['status']}")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        lliurex_fetch.close_session()